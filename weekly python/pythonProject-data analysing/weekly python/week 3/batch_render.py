@@ -0,0 +1,148 @@
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from render_cache import RenderCache
+from weather_loader import load_observations, resample_observations
+
+# 批量无界面渲染气象仪表盘：从观测数据中取出若干 (站点, 年份)，
+# 在进程池中并行绘制，每个工作进程只初始化一次字体缓存和画布模板，
+# 每份仪表盘的 JPG 和 PDF 同时导出，最后报告每分钟渲染的仪表盘数量。
+# 数据、绘图函数和样式都没有变化的仪表盘直接使用渲染缓存，不再重新绘制。
+
+output_dir = 'dashboards'
+cache_dir = 'render_cache'
+# 每个工作进程自己的画布模板、导出线程和渲染缓存，由 init_worker 创建
+worker = {}
+
+
+def init_worker(out_dir, dpi, cache_path=None, points_per_pixel=2):
+    """工作进程初始化：预热字体查找缓存，创建画布模板、导出线程和渲染缓存"""
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+    import weather_dashboard
+
+    weather_dashboard.points_per_pixel = points_per_pixel
+    font_manager.findfont(font_manager.FontProperties(family=plt.rcParams['font.sans-serif']))
+    fig, axes = weather_dashboard.create_dashboard()
+    worker.update(fig=fig, axes=axes, exporter=ThreadPoolExecutor(max_workers=1), out_dir=out_dir, dpi=dpi,
+                  cache=RenderCache(cache_path) if cache_path else None)
+
+
+def render_job(station, year, df):
+    """
+    在当前进程的画布模板上绘制并导出一份仪表盘，返回 (站点, 年份, 耗时秒, 结果)。
+    结果为 rendered（重新渲染）、restored（从缓存复制）或 unchanged（输出文件已是最新）。
+    """
+    from weather_dashboard import dashboard_key, draw_dashboard, save_dashboard
+
+    begin = time.perf_counter()
+    title = f'{station}{year}年气象数据可视化分析'
+    basename = os.path.join(worker['out_dir'], f'{station}_{year}')
+    cache = worker['cache']
+    if cache is not None:
+        key = dashboard_key(df, title, worker['dpi'])
+        status = cache.fetch(key, basename)
+        if status:
+            return station, year, time.perf_counter() - begin, status
+
+    draw_dashboard(worker['fig'], worker['axes'], df, title)
+    save_dashboard(worker['fig'], basename, worker['dpi'], worker['exporter'])
+    if cache is not None:
+        cache.store(key, basename)
+    return station, year, time.perf_counter() - begin, 'rendered'
+
+
+def parse_job(text):
+    """把 “宁波:2024” 解析为 ('宁波', 2024)"""
+    station, _, year = text.rpartition(':')
+    if not station or not year.isdigit():
+        raise argparse.ArgumentTypeError(f"任务格式应为 站点:年份，例如 宁波:2024，而不是 {text!r}")
+    return station, int(year)
+
+
+def make_jobs(observations, freq='month', jobs=None):
+    """
+    按站点和年份切分汇总后的数据，返回 [(站点, 年份, DataFrame)]。
+    只把汇总后的少量行发送给工作进程，原始观测数据只在主进程中读取一次。
+    """
+    observations = observations.assign(年份=observations['日期'].dt.year)
+    wanted = set(jobs) if jobs else None
+    result = []
+    for (station, year), group in observations.groupby(['站点', '年份'], observed=True, sort=True):
+        if wanted is not None and (station, year) not in wanted:
+            continue
+        result.append((station, int(year), resample_observations(group.drop(columns='年份'), freq)))
+    if wanted is not None:
+        missing = wanted - {(station, year) for station, year, _ in result}
+        if missing:
+            print(f"数据中没有这些任务: {', '.join(f'{s}:{y}' for s, y in sorted(missing))}")
+    return result
+
+
+def render_all(jobs, out_dir=output_dir, workers=None, dpi=300, cache_path=cache_dir, points_per_pixel=2):
+    """
+    渲染全部任务，返回 (总耗时秒, 各结果的数量)；workers 为 1 时在当前进程中依次渲染，
+    cache_path 为 None 时不使用渲染缓存，points_per_pixel 为 None 时不降采样
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    counts = Counter()
+    begin = time.perf_counter()
+    if workers == 1:
+        init_worker(out_dir, dpi, cache_path, points_per_pixel)
+        results = (render_job(*job) for job in jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(out_dir, dpi, cache_path, points_per_pixel))
+        futures = [executor.submit(render_job, *job) for job in jobs]
+        results = (future.result() for future in as_completed(futures))
+    try:
+        for station, year, seconds, status in results:
+            counts[status] += 1
+            print(f"{station} {year} 年  {seconds:6.2f}s  {status}")
+    finally:
+        if workers != 1:
+            executor.shutdown(cancel_futures=True)
+    if cache_path:
+        # 淘汰过期或超出容量的缓存条目
+        RenderCache(cache_path).evict()
+    return time.perf_counter() - begin, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量无界面渲染气象仪表盘')
+    parser.add_argument('--data', default='ningbo_weather_2024_processed.csv', help='逐月、逐日或逐时观测数据 CSV')
+    parser.add_argument('--station', default='宁波', help='数据文件没有站点列时使用的站点名')
+    parser.add_argument('--jobs', type=parse_job, nargs='+', default=None,
+                        help='要渲染的 站点:年份，默认渲染数据中的全部站点和年份')
+    parser.add_argument('--freq', choices=['hour', 'day', 'month', 'season', 'year'], default='month', help='汇总频率')
+    parser.add_argument('--workers', type=int, default=None, help='工作进程数，默认为 CPU 核数，1 表示不使用进程池')
+    parser.add_argument('--dpi', type=int, default=300, help='导出分辨率')
+    parser.add_argument('--points-per-pixel', type=float, default=2,
+                        help='逐日、逐时数据每像素宽度保留的点数，0 表示不降采样')
+    parser.add_argument('--output-dir', default=output_dir, help='输出目录')
+    parser.add_argument('--cache-dir', default=cache_dir, help='渲染缓存目录')
+    parser.add_argument('--no-cache', action='store_true', help='不使用渲染缓存，全部重新渲染')
+    args = parser.parse_args()
+
+    stations = sorted({station for station, _ in args.jobs}) if args.jobs else None
+    years = sorted({year for _, year in args.jobs}) if args.jobs else None
+    observations = load_observations(args.data, station=args.station, stations=stations, years=years)
+    jobs = make_jobs(observations, args.freq, args.jobs)
+    if not jobs:
+        raise SystemExit('没有可渲染的任务')
+
+    elapsed, counts = render_all(jobs, args.output_dir, args.workers, args.dpi,
+                                 None if args.no_cache else args.cache_dir, args.points_per_pixel or None)
+    summary = '，'.join(f'{status} {count}' for status, count in counts.most_common())
+    print(f"共 {len(jobs)} 个仪表盘（{summary}），用时 {elapsed:.1f}s，{len(jobs) / elapsed * 60:.1f} 个/分钟")
+
+
+if __name__ == '__main__':
+    main()
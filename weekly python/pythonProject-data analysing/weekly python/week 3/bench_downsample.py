@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+import weather_dashboard
+from weather_loader import aqi_category, dtypes
+
+# 降采样基准测试：用合成的一年逐日、逐时（或 --freqs 指定间隔）观测数据绘制仪表盘，
+# 分别在降采样和不降采样时测量绘制耗时、导出耗时以及 JPG、PDF 文件大小。
+
+default_freqs = ['D', 'h']
+
+
+def synthetic_weather(freq, year=2024, station='宁波', seed=0):
+    """生成一年的合成观测数据，列和类型与 weather_loader.load_observations 的结果相同"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(f'{year}-01-01', f'{year + 1}-01-01', freq=freq, inclusive='left')
+    n = len(dates)
+    season = np.sin((dates.dayofyear.to_numpy() - 100) / 365 * 2 * np.pi)
+    daily = np.sin((dates.hour.to_numpy() - 8) / 24 * 2 * np.pi)
+    high = 20 + 10 * season + 3 * daily + rng.normal(0, 2, n)
+    aqi = rng.gamma(4, 12, n).round()
+    df = pd.DataFrame({
+        '站点': station,
+        '日期': dates,
+        '高温': high,
+        '低温': high - rng.uniform(2, 8, n),
+        'AQI': aqi,
+        '能见度': rng.uniform(3, 25, n),
+        '风速': rng.uniform(1, 20, n),
+        # 约三成时段有降雨
+        '总降雨': rng.exponential(2, n) * (rng.random(n) < 0.3),
+        '空气质量': aqi_category(aqi).astype(object),
+    })
+    return df.astype(dtypes)
+
+
+def measure(df, points_per_pixel, workdir, dpi):
+    """绘制并导出一份仪表盘，返回 (绘制秒, 导出秒, JPG 字节数, PDF 字节数)"""
+    weather_dashboard.points_per_pixel = points_per_pixel
+    fig, axes = weather_dashboard.create_dashboard()
+    begin = time.perf_counter()
+    weather_dashboard.draw_dashboard(fig, axes, df, '宁波2024年气象数据可视化分析')
+    drawn = time.perf_counter()
+    basename = os.path.join(workdir, f'dashboard_{len(df)}_{points_per_pixel}')
+    jpg_file, pdf_file = weather_dashboard.save_dashboard(fig, basename, dpi)
+    saved = time.perf_counter()
+    return drawn - begin, saved - drawn, os.path.getsize(jpg_file), os.path.getsize(pdf_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='仪表盘降采样基准测试')
+    parser.add_argument('--freqs', nargs='+', default=default_freqs, help='合成数据的时间间隔（pandas 频率字符串）')
+    parser.add_argument('--points-per-pixel', type=float, default=weather_dashboard.points_per_pixel,
+                        help='降采样时每像素宽度保留的点数')
+    parser.add_argument('--dpi', type=int, default=300, help='导出分辨率')
+    args = parser.parse_args()
+
+    print(f"{'数据':<14}{'降采样':<8}{'绘制':>8}{'导出':>8}{'JPG':>10}{'PDF':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for freq in args.freqs:
+            df = synthetic_weather(freq)
+            results = {}
+            for label, points_per_pixel in (('否', None), ('是', args.points_per_pixel)):
+                draw, save, jpg_size, pdf_size = measure(df, points_per_pixel, workdir, args.dpi)
+                results[label] = draw + save
+                print(f"{f'{freq} {len(df)} 行':<14}{label:<8}{draw:7.2f}s{save:7.2f}s"
+                      f"{jpg_size / 1024:8.0f}KB{pdf_size / 1024:8.0f}KB")
+            print(f"{'':<14}加速 {results['否'] / results['是']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
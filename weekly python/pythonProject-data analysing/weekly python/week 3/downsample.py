@@ -0,0 +1,90 @@
+import numpy as np
+
+# 时间序列降采样：逐日、逐时数据的点数远多于图中的像素，
+# 绘图前把数据压缩到与子图像素宽度相当的点数，同时保留最高、最低等视觉上的极值。
+#   lttb            — 折线，Largest-Triangle-Three-Buckets 算法，返回保留点的下标
+#   minmax_envelope — 填充区域，每个区间取下界的最小值和上界的最大值
+#   bin_bars        — 柱状图，每个区间的数值求和（例如降雨量）
+
+
+def as_numeric(x):
+    """把日期或数值数组转换为 float64，供面积计算使用"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[s]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def bin_starts(n, bins):
+    """把 n 个点均匀分为 bins 个区间，返回每个区间起点的下标"""
+    return np.unique(np.linspace(0, n, bins, endpoint=False).astype(np.int64))
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets 降采样，返回保留点的下标（升序）。
+    首尾两点总是保留；中间每个桶选出与上一个选中点、下一个桶平均点构成三角形面积最大的点，
+    因此峰值和谷值会被保留下来。
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = as_numeric(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 中间的 n - 2 个点分为 threshold - 2 个桶，edges[i]:edges[i + 1] 是第 i 个桶
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    bounds = np.append(edges, n)
+    # 每个桶的平均点，最后一个 “桶” 是末尾一个点
+    sizes = np.diff(bounds)
+    mean_x = np.add.reduceat(x, bounds[:-1]) / sizes
+    mean_y = np.add.reduceat(y, bounds[:-1]) / sizes
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_envelope(x, low, high, bins):
+    """
+    把填充区域压缩为 bins 个区间，返回 (x, 下界, 上界)。
+    每个区间取下界的最小值、上界的最大值，末尾再补上最后一个点，区域覆盖完整的时间范围。
+    """
+    x = np.asarray(x)
+    n = len(x)
+    if bins >= n:
+        return x, np.asarray(low), np.asarray(high)
+    starts = bin_starts(n, bins)
+    lows = np.fmin.reduceat(np.asarray(low, dtype=np.float64), starts)
+    highs = np.fmax.reduceat(np.asarray(high, dtype=np.float64), starts)
+    return np.append(x[starts], x[-1:]), np.append(lows, lows[-1]), np.append(highs, highs[-1])
+
+
+def bin_bars(x, y, bins):
+    """
+    把柱状图压缩为 bins 个区间，返回 (区间起点, 区间内数值之和, 区间宽度)。
+    区间宽度与 x 的单位相同，日期则以天为单位，可直接作为 ax.bar 的 width。
+    """
+    x = np.asarray(x)
+    n = len(x)
+    starts = bin_starts(n, min(bins, n))
+    totals = np.add.reduceat(np.nan_to_num(np.asarray(y, dtype=np.float64)), starts)
+    numeric = as_numeric(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        numeric = numeric / 86400
+    # 最后一个区间的宽度按平均点距估算
+    step = (numeric[-1] - numeric[0]) / (n - 1) if n > 1 else 1.0
+    widths = np.diff(np.append(numeric[starts], numeric[-1] + step))
+    return x[starts], totals, widths
+
+
+def target_points(ax, points_per_pixel):
+    """子图在画布上的像素宽度乘以每像素点数，得到降采样的目标点数"""
+    return max(3, int(ax.bbox.width * points_per_pixel))
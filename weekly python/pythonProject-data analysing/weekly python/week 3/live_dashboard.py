@@ -0,0 +1,424 @@
+import argparse
+import collections
+import csv
+import io
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from weather_dashboard import colors, figsize
+from weather_loader import aqi_labels, column_aliases, load_observations, normalize, validate
+
+# 实时气象仪表盘：持续接收新的观测数据，适合作为大屏常驻显示。
+# 所有图形元素只创建一次，新数据到来时用 set_data / set_height 原地更新，
+# 只对数据发生变化的子图做 blit 局部重绘。历史数据保存在定长的滚动窗口中，
+# 内存占用和每次重绘的开销只与窗口大小有关，与运行了多久无关。
+
+live_columns = ['高温', '低温', '能见度', '风速', '总降雨', '空气质量代码']
+
+
+class RollingWindow:
+    """
+    定长滚动窗口。每列预分配 2 * size 的数组，每个值同时写入 i 和 i + size 两个位置，
+    最近的 size 个值总是一段连续的切片：追加是 O(1)，读取不需要复制，内存占用固定。
+    """
+
+    def __init__(self, columns, size):
+        self.size = size
+        self.count = 0
+        self.data = {column: np.full(2 * size, np.nan) for column in columns}
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def oldest(self, column):
+        """窗口已满时，下一次追加将要移出窗口的值"""
+        return self.data[column][self.count % self.size]
+
+    def append(self, values):
+        i = self.count % self.size
+        for column, array in self.data.items():
+            array[i] = array[i + self.size] = values.get(column, np.nan)
+        self.count += 1
+
+    def view(self, column):
+        """窗口内的值，从旧到新"""
+        if not self.count:
+            return self.data[column][:0]
+        end = (self.count - 1) % self.size + self.size + 1
+        return self.data[column][end - len(self):end]
+
+
+def _expand(low, high, values, margin=0.1):
+    """values 超出 [low, high] 时返回扩大后的范围，否则返回 None"""
+    values = values[~np.isnan(values)]
+    if not len(values) or (values.min() >= low and values.max() <= high):
+        return None
+    low, high = min(low, values.min()), max(high, values.max())
+    pad = (high - low) * margin or 1
+    return low - pad, high + pad
+
+
+class LiveDashboard:
+    """
+    实时仪表盘。append 加入一条观测，update 重绘有变化的子图。
+
+    横轴为窗口内的相对位置（0 为最新一条），坐标轴本身不随时间滚动，
+    因此背景只在纵轴范围需要扩大或窗口大小改变时重新生成。
+    """
+
+    def __init__(self, fig=None, window=500, bar_count=24):
+        self.fig = fig if fig is not None else plt.figure(figsize=figsize, dpi=100)
+        self.canvas = self.fig.canvas
+        self.window = RollingWindow(live_columns, window)
+        self.bar_count = bar_count
+        self.aqi_counts = np.zeros(len(aqi_labels), dtype=np.int64)
+        self.latest = None
+        self.backgrounds = {}
+        self.full_redraw = True
+        # 每个子图的 (宿主子图, 刷新函数, 动态元素列表)
+        self.panels = []
+        # 每个刷新函数上一次显示的数据，用于判断子图是否有变化
+        self.shown = {}
+
+        grid = self.fig.add_gridspec(3, 3)
+        self._create_temperature(self.fig.add_subplot(grid[0, :2]))
+        self._create_rainfall(self.fig.add_subplot(grid[0, 2]))
+        self._create_visibility_wind(self.fig.add_subplot(grid[1, :2]))
+        self._create_air_quality(self.fig.add_subplot(grid[1, 2], projection='polar'))
+        self._create_temp_rainfall(self.fig.add_subplot(grid[2, :]))
+        self.title = self.fig.suptitle('实时气象数据', fontsize=16)
+        self.fig.tight_layout()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    # ---- 创建图形元素 ----
+
+    def _window_axis(self, ax):
+        ax.set_xlim(-self.window.size + 1, 0)
+        ax.set_xlabel('距最新观测的条数')
+        ax.grid(linestyle='--', alpha=0.5)
+
+    @staticmethod
+    def _band(ax, color):
+        return ax.fill_between([0, 0], [0, 0], [0, 0], color=color, alpha=0.3, animated=True)
+
+    def _create_temperature(self, ax):
+        self.high_line, = ax.plot([], [], color=colors[0], label='高温', animated=True)
+        self.low_line, = ax.plot([], [], color=colors[1], label='低温', animated=True)
+        self.band = self._band(ax, colors[2])
+        self.status = ax.text(0.01, 0.95, '', transform=ax.transAxes, va='top', animated=True)
+        ax.set_ylim(-10, 40)
+        ax.set_title('温度趋势（℃）')
+        self._window_axis(ax)
+        ax.legend(loc='upper right')
+        self.panels.append((ax, self._refresh_temperature, [self.band, self.high_line, self.low_line, self.status]))
+
+    def _create_rainfall(self, ax):
+        x = np.arange(-self.bar_count + 1, 1)
+        self.rain_bars = ax.bar(x, np.zeros(self.bar_count), color=colors[3], alpha=0.7, animated=True)
+        ax.set_xlim(-self.bar_count + 0.5, 0.5)
+        ax.set_ylim(0, 10)
+        ax.set_title(f'最近 {self.bar_count} 条降雨量（mm）')
+        ax.grid(axis='y', linestyle='--', alpha=0.5)
+        self.panels.append((ax, self._refresh_rainfall, list(self.rain_bars)))
+
+    def _create_visibility_wind(self, ax):
+        self.visibility_line, = ax.plot([], [], color=colors[5], linestyle='--', animated=True)
+        ax.set_ylabel('能见度 (km)', color=colors[5])
+        ax.tick_params(axis='y', labelcolor=colors[5])
+        ax.set_ylim(0, 30)
+        self._window_axis(ax)
+        self.wind_axis = ax.twinx()
+        self.wind_line, = self.wind_axis.plot([], [], color=colors[6], linestyle='-.', animated=True)
+        self.wind_axis.set_ylabel('风速 (km/h)', color=colors[6])
+        self.wind_axis.tick_params(axis='y', labelcolor=colors[6])
+        self.wind_axis.set_ylim(0, 20)
+        ax.set_title('能见度与风速关系')
+        self.panels.append((ax, self._refresh_visibility_wind, [self.visibility_line, self.wind_line]))
+
+    def _create_air_quality(self, ax):
+        theta = np.linspace(0, 2 * np.pi, len(aqi_labels), endpoint=False)
+        rose_colors = plt.cm.viridis(np.linspace(0, 1, len(aqi_labels)))
+        self.rose_bars = ax.bar(theta, np.zeros(len(aqi_labels)), width=np.pi / len(aqi_labels), align='edge',
+                                color=rose_colors, alpha=0.7, edgecolor='black', animated=True)
+        ax.set_theta_zero_location('N')
+        ax.set_theta_direction(-1)
+        ax.set_xticks(theta)
+        ax.set_xticklabels(aqi_labels)
+        ax.set_ylim(0, 10)
+        ax.set_title('空气质量分布', y=1.08)
+        self.panels.append((ax, self._refresh_air_quality, list(self.rose_bars)))
+
+    def _create_temp_rainfall(self, ax):
+        self.combined_high, = ax.plot([], [], color=colors[0], label='高温', animated=True)
+        self.combined_low, = ax.plot([], [], color=colors[1], label='低温', animated=True)
+        self.combined_band = self._band(ax, colors[2])
+        ax.set_ylabel('温度 (℃)', color=colors[1])
+        ax.set_ylim(-10, 40)
+        self._window_axis(ax)
+        ax.legend(loc='upper left')
+        self.rain_axis = ax.twinx()
+        self.rain_line, = self.rain_axis.step([], [], color=colors[3], alpha=0.6, where='mid', label='降雨量',
+                                             animated=True)
+        self.rain_axis.set_ylabel('降雨量 (mm)', color=colors[4])
+        self.rain_axis.set_ylim(0, 10)
+        self.rain_axis.legend(loc='upper right')
+        ax.set_title('温度与降雨量复合分析')
+        self.panels.append((ax, self._refresh_temp_rainfall,
+                            [self.combined_band, self.combined_high, self.combined_low, self.rain_line]))
+
+    # ---- 追加数据 ----
+
+    def append(self, observation):
+        """加入一条观测（weather_loader 统一后的列名组成的字典）"""
+        category = observation.get('空气质量')
+        code = aqi_labels.index(category) if category in aqi_labels else np.nan
+        if len(self.window) == self.window.size:
+            evicted = self.window.oldest('空气质量代码')
+            if not np.isnan(evicted):
+                self.aqi_counts[int(evicted)] -= 1
+        if not np.isnan(code):
+            self.aqi_counts[code] += 1
+        values = {column: observation.get(column, np.nan) for column in live_columns}
+        values['空气质量代码'] = code
+        self.window.append(values)
+        self.latest = observation
+
+    # ---- 刷新各子图，返回该子图是否有变化 ----
+
+    def _changed(self, name, *arrays):
+        previous = self.shown.get(name)
+        if previous is not None and all(np.array_equal(a, b, equal_nan=True) for a, b in zip(previous, arrays)):
+            return False
+        self.shown[name] = tuple(np.copy(a) for a in arrays)
+        return True
+
+    def _fit(self, ax, values):
+        """数据超出纵轴范围时扩大范围，并安排一次完整重绘"""
+        low, high = ax.get_ylim()
+        limits = _expand(low, high, values)
+        if limits is not None:
+            ax.set_ylim(*limits)
+            self.full_redraw = True
+
+    def _x(self):
+        return np.arange(-len(self.window) + 1, 1)
+
+    @staticmethod
+    def _set_band(band, x, high, low):
+        band.set_verts([np.column_stack([np.concatenate([x, x[::-1]]), np.concatenate([high, low[::-1]])])])
+
+    def _refresh_temperature(self, ax):
+        high, low = self.window.view('高温'), self.window.view('低温')
+        if not self._changed('temperature', high, low):
+            return False
+        x = self._x()
+        self.high_line.set_data(x, high)
+        self.low_line.set_data(x, low)
+        self._set_band(self.band, x, high, low)
+        if self.latest is not None:
+            self.status.set_text(f"{pd.Timestamp(self.latest['日期']):%Y-%m-%d %H:%M}  "
+                                 f"高温 {self.latest['高温']:g}℃  低温 {self.latest['低温']:g}℃")
+        self._fit(ax, np.concatenate([high, low]))
+        return True
+
+    def _refresh_rainfall(self, ax):
+        rain = self.window.view('总降雨')[-self.bar_count:]
+        if not self._changed('rainfall', rain):
+            return False
+        heights = np.zeros(self.bar_count)
+        heights[self.bar_count - len(rain):] = np.nan_to_num(rain)
+        for bar, height in zip(self.rain_bars, heights):
+            bar.set_height(height)
+        self._fit(ax, heights)
+        return True
+
+    def _refresh_visibility_wind(self, ax):
+        visibility, wind = self.window.view('能见度'), self.window.view('风速')
+        if not self._changed('visibility_wind', visibility, wind):
+            return False
+        x = self._x()
+        self.visibility_line.set_data(x, visibility)
+        self.wind_line.set_data(x, wind)
+        self._fit(ax, visibility)
+        self._fit(self.wind_axis, wind)
+        return True
+
+    def _refresh_air_quality(self, ax):
+        if not self._changed('air_quality', self.aqi_counts):
+            return False
+        for bar, count in zip(self.rose_bars, self.aqi_counts):
+            bar.set_height(count)
+        self._fit(ax, self.aqi_counts.astype(float))
+        return True
+
+    def _refresh_temp_rainfall(self, ax):
+        high, low, rain = self.window.view('高温'), self.window.view('低温'), self.window.view('总降雨')
+        if not self._changed('temp_rainfall', high, low, rain):
+            return False
+        x = self._x()
+        self.combined_high.set_data(x, high)
+        self.combined_low.set_data(x, low)
+        self._set_band(self.combined_band, x, high, low)
+        self.rain_line.set_data(x, rain)
+        self._fit(ax, np.concatenate([high, low]))
+        self._fit(self.rain_axis, rain)
+        return True
+
+    # ---- 绘制 ----
+
+    def _on_draw(self, event):
+        """完整绘制后重新保存各子图的背景，并画上动态元素"""
+        self.backgrounds = {ax: self.canvas.copy_from_bbox(ax.bbox) for ax, _, _ in self.panels}
+        for ax, _, artists in self.panels:
+            for artist in artists:
+                ax.draw_artist(artist)
+
+    def update(self):
+        """重绘有变化的子图，返回重绘的子图数量"""
+        changed = [(ax, artists) for ax, refresh, artists in self.panels if refresh(ax)]
+        if self.full_redraw or not self.backgrounds:
+            # 纵轴范围改变或首次显示，需要完整绘制一次
+            self.full_redraw = False
+            self.canvas.draw()
+            return len(self.panels)
+        for ax, artists in changed:
+            self.canvas.restore_region(self.backgrounds[ax])
+            for artist in artists:
+                ax.draw_artist(artist)
+            self.canvas.blit(ax.bbox)
+        self.canvas.flush_events()
+        return len(changed)
+
+
+def replay(frame):
+    """按时间顺序逐条返回已有的观测数据"""
+    for start in range(0, len(frame), 10000):
+        yield from frame.iloc[start:start + 10000].to_dict('records')
+
+
+def _parse_lines(header, lines, station, source):
+    raw = pd.read_csv(io.StringIO(header + ''.join(lines)), dtype=str)
+    return validate(normalize(raw, station), raw, source=source).to_dict('records')
+
+
+def _observations(header, lines, station, source):
+    """解析若干行 CSV，只返回 station 的观测；整批校验失败时逐行解析，跳过有问题的行"""
+    try:
+        result = _parse_lines(header, lines, station, source)
+    except ValueError:
+        result = []
+        for line in lines:
+            try:
+                result += _parse_lines(header, [line], station, source)
+            except ValueError as e:
+                print(f"跳过无法解析的数据: {e}")
+    if station is None:
+        return result
+    # 与回放时一样按 站点 == station 过滤；文件没有站点列时 normalize 已把站点填为 station
+    return [observation for observation in result if observation['站点'] == station]
+
+
+def _station_matcher(header, station):
+    """
+    返回判断一行原始 CSV 是否属于 station 的函数，只拆分字段、不做类型转换；
+    不按站点过滤或文件没有站点列时返回 None（所有行都属于该站点）
+    """
+    columns = [column_aliases.get(column.strip()) for column in next(csv.reader([header]), [])]
+    if station is None or '站点' not in columns:
+        return None
+    index = columns.index('站点')
+
+    def matches(line):
+        fields = next(csv.reader([line]), [])
+        return len(fields) > index and fields[index].strip() == station
+    return matches
+
+
+def follow_csv(path, station=None, history=0, poll=1.0):
+    """
+    跟踪不断追加的观测 CSV（类似 tail -f），逐条返回 station 新的观测。
+    启动时先返回文件中该站点最后 history 条已有记录；无法解析的新行会被跳过并给出提示。
+    """
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        header = f.readline()
+        matches = _station_matcher(header, station)
+        # 只保留该站点最后 history 行，内存占用与文件大小无关；
+        # 最后一行可能还没写完，留到后面读到换行符时再解析
+        recent = collections.deque(maxlen=history)
+        pending = ''
+        for line in f:
+            if not line.endswith('\n'):
+                pending = line
+            elif matches is None or matches(line):
+                recent.append(line)
+        if recent:
+            yield from _observations(header, list(recent), station, path)
+        while True:
+            chunk = f.read()
+            if not chunk:
+                time.sleep(poll)
+                continue
+            pending += chunk
+            complete, newline, pending = pending.rpartition('\n')
+            if not newline:
+                pending = complete + pending
+                continue
+            yield from _observations(header, (complete + '\n').splitlines(keepends=True), station, path)
+
+
+def run_live(feed, station, window=500, bar_count=24, interval=0.2, headless=False, frames=None):
+    """
+    用 feed 逐条提供的观测驱动实时仪表盘，直到数据结束、窗口被关闭或处理了 frames 条。
+    结束时打印每帧重绘耗时的统计。
+    """
+    if headless:
+        plt.switch_backend('Agg')
+    dashboard = LiveDashboard(window=window, bar_count=bar_count)
+    dashboard.title.set_text(f'{station}实时气象数据')
+    if not headless:
+        plt.show(block=False)
+
+    timings = []
+    for frame, observation in enumerate(feed, 1):
+        dashboard.append(observation)
+        begin = time.perf_counter()
+        dashboard.update()
+        timings.append(time.perf_counter() - begin)
+        if frames and frame >= frames:
+            break
+        if not headless and not plt.fignum_exists(dashboard.fig.number):
+            break
+        if interval and not headless:
+            dashboard.canvas.start_event_loop(interval)
+
+    if timings:
+        timings = np.array(timings) * 1000
+        tail = timings[-min(100, len(timings)):]
+        print(f"共 {len(timings)} 帧，平均重绘 {timings.mean():.1f} ms，最近 {len(tail)} 帧平均 {tail.mean():.1f} ms，"
+              f"最长 {timings.max():.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='实时气象仪表盘')
+    parser.add_argument('--data', default='ningbo_weather_2024_processed.csv', help='观测数据 CSV')
+    parser.add_argument('--station', default='宁波', help='站点；数据文件没有站点列时作为站点名')
+    parser.add_argument('--follow', action='store_true', help='持续跟踪数据文件中新追加的观测')
+    parser.add_argument('--window', type=int, default=500, help='滚动窗口保留的观测条数')
+    parser.add_argument('--bars', type=int, default=24, help='降雨量柱状图显示的最近条数')
+    parser.add_argument('--interval', type=float, default=0.2, help='回放时每条观测之间的间隔秒数')
+    parser.add_argument('--headless', action='store_true', help='不显示窗口，只统计重绘耗时')
+    parser.add_argument('--frames', type=int, default=None, help='处理这么多条观测后退出')
+    args = parser.parse_args()
+
+    if args.follow:
+        feed = follow_csv(args.data, args.station, history=args.window)
+    else:
+        observations = load_observations(args.data, station=args.station)
+        feed = replay(observations[observations['站点'] == args.station])
+    run_live(feed, args.station, args.window, args.bars, args.interval, args.headless, args.frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from collections import Counter
+
+import pandas as pd
+
+# 缓存条目的默认最长保存时间（秒）和缓存目录的最大容量（字节）
+default_max_age = 30 * 24 * 3600
+default_max_bytes = 500 * 1024 * 1024
+
+
+def frame_digest(df):
+    """DataFrame 内容的哈希：列名、类型和每个值，不包括索引"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()], ensure_ascii=False).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def source_digest(func):
+    """函数源代码的哈希，函数修改后缓存键随之改变"""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def style_digest(style):
+    """绘图参数（rcParams、配色、分辨率等）的哈希"""
+    text = json.dumps(style, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def render_key(parts):
+    """把各部分的哈希合并为一个缓存键"""
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    按内容寻址的图表输出缓存。
+
+    缓存键由输入数据、绘图函数和样式参数的哈希组成。每个键对应 <key>.json 和
+    渲染好的文件 <key>.jpg、<key>.pdf；outputs/ 下记录每个输出文件上次写入时的键和
+    文件大小、修改时间。再次渲染时：输出文件未被改动且键相同则什么都不做（unchanged），
+    缓存中有该键则直接复制到输出位置（restored），否则由调用方重新渲染后保存（stored）。
+    各文件都先写临时文件再替换，多个进程可以同时使用同一缓存目录。
+    """
+
+    def __init__(self, cache_dir='render_cache', max_age=default_max_age, max_bytes=default_max_bytes):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        os.makedirs(os.path.join(cache_dir, 'outputs'), exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _output_record(self, basename):
+        name = hashlib.sha1(os.path.abspath(basename).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'outputs', name + '.json')
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _copy(source, target):
+        tmp_path = f'{target}.{os.getpid()}.tmp'
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+
+    @staticmethod
+    def _file_state(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _read_json(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key):
+        """刷新条目的最近使用时间，淘汰时按它排序"""
+        entry = self._read_json(self._path(key, '.json'))
+        if isinstance(entry, dict):
+            entry['used'] = time.time()
+            self._write_json(self._path(key, '.json'), entry)
+
+    def _record_outputs(self, key, basename, suffixes):
+        files = {suffix: self._file_state(basename + suffix) for suffix in suffixes}
+        self._write_json(self._output_record(basename), {'key': key, 'files': files})
+
+    def fetch(self, key, basename, suffixes=('.jpg', '.pdf')):
+        """
+        输出文件已是该键的内容或能从缓存恢复时返回 'unchanged' / 'restored'，
+        需要重新渲染时返回 None。
+        """
+        record = self._read_json(self._output_record(basename))
+        if record is not None and record.get('key') == key:
+            try:
+                unchanged = all(self._file_state(basename + suffix) == record['files'].get(suffix)
+                                for suffix in suffixes)
+            except OSError:
+                unchanged = False
+            if unchanged:
+                self._touch(key)
+                self.stats['unchanged'] += 1
+                return 'unchanged'
+
+        entry = self._read_json(self._path(key, '.json'))
+        # 损坏或缺少 used 字段的条目按未命中处理，由 evict 清理
+        used = entry.get('used') if isinstance(entry, dict) else None
+        if not isinstance(used, (int, float)) or time.time() - used > self.max_age:
+            self.stats['missed'] += 1
+            return None
+        try:
+            for suffix in suffixes:
+                self._copy(self._path(key, suffix), basename + suffix)
+        except OSError:
+            self.stats['missed'] += 1
+            return None
+        self._touch(key)
+        self._record_outputs(key, basename, suffixes)
+        self.stats['restored'] += 1
+        return 'restored'
+
+    def store(self, key, basename, suffixes=('.jpg', '.pdf')):
+        """把刚渲染好的输出文件保存到缓存"""
+        size = 0
+        for suffix in suffixes:
+            self._copy(basename + suffix, self._path(key, suffix))
+            size += os.path.getsize(basename + suffix)
+        self._write_json(self._path(key, '.json'), {'key': key, 'suffixes': list(suffixes), 'size': size,
+                                                    'used': time.time()})
+        self._record_outputs(key, basename, suffixes)
+        self.stats['stored'] += 1
+
+    def _entry_files(self, key):
+        """条目在缓存目录中的所有文件（<key>.json、<key>.jpg 等），不包括其他进程正在写入的临时文件"""
+        pattern = glob.escape(self._path(key, '')) + '.*'
+        return [path for path in glob.glob(pattern) if not path.endswith('.tmp')]
+
+    def evict(self):
+        """删除过期条目；总大小超过上限时按最近使用时间从旧到新删除"""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            entry = self._read_json(os.path.join(self.cache_dir, name))
+            key = name[:-len('.json')]
+            used = entry.get('used') if isinstance(entry, dict) else None
+            size = entry.get('size') if isinstance(entry, dict) else None
+            if not isinstance(used, (int, float)) or not isinstance(size, int):
+                # 损坏的条目最先删除，大小按磁盘上的文件计算
+                size = 0
+                for path in self._entry_files(key):
+                    try:
+                        size += os.path.getsize(path)
+                    except OSError:
+                        pass
+                entries.append((0, size, key))
+            else:
+                entries.append((used, size, key))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for used, size, key in entries:
+            if now - used <= self.max_age and total <= self.max_bytes:
+                break
+            for path in self._entry_files(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,271 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import seaborn as sns
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+from downsample import bin_bars, lttb, minmax_envelope, target_points
+from render_cache import frame_digest, render_key, source_digest, style_digest
+from weather_stats import WeatherStats, dashboard_stats, summarize
+
+# 气象数据仪表盘：3x3 布局的五个子图。画布和子图布局只创建一次，
+# 之后每个站点、年份的数据都在同一画布上重新绘制，适合批量渲染。
+# 逐日、逐时数据在绘制前按子图的像素宽度降采样（见 downsample.py）。
+# 各子图的参数是共用的统计结果（见 weather_stats.py），子图只从中读取数据，不再自己分组汇总。
+
+# 设置中文显示
+plt.rcParams['font.sans-serif'] = ['SimHei']
+plt.rcParams['axes.unicode_minus'] = False
+colors = sns.color_palette("Set2")
+figsize = (18, 12)
+# 每像素宽度保留的数据点数，None 表示不降采样
+points_per_pixel = 2
+# 降采样后点数超过该值时不再绘制每个点的标记和柱子上的数值
+max_markers = 60
+# 降采样后每根柱子至少占用的像素宽度
+min_bar_pixels = 3
+
+
+def _line(ax, x, y, **kwargs):
+    """绘制折线；点数超过子图像素宽度对应的目标点数时先用 LTTB 降采样"""
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    if points_per_pixel:
+        target = target_points(ax, points_per_pixel)
+        if len(y) > target:
+            valid = ~np.isnan(y)
+            x, y = x[valid], y[valid]
+            selected = lttb(x, y, target)
+            x, y = x[selected], y[selected]
+        if len(y) > max_markers:
+            kwargs.pop('marker', None)
+    return ax.plot(x, y, **kwargs)
+
+
+def _band(ax, x, high, low, **kwargs):
+    """绘制填充区域；点数过多时压缩为每个区间的最小值、最大值包络"""
+    if points_per_pixel:
+        target = target_points(ax, points_per_pixel)
+        if len(x) > target:
+            x, low, high = minmax_envelope(x, low, high, target)
+    return ax.fill_between(x, high, low, **kwargs)
+
+
+def _bars(ax, x, y, **kwargs):
+    """绘制柱状图；柱子过多时按区间求和，每根柱子至少占 min_bar_pixels 像素"""
+    if points_per_pixel:
+        bins = min(target_points(ax, points_per_pixel), int(ax.bbox.width / min_bar_pixels))
+        if len(x) > bins:
+            x, y, widths = bin_bars(x, y, bins)
+            kwargs.update(width=widths, align='edge')
+    return ax.bar(x, y, **kwargs)
+
+
+def _label_bars(ax, bars):
+    """在柱子上方标注数值；降采样后柱子过多时不标注"""
+    if points_per_pixel and len(bars) > max_markers:
+        return
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{height:g}mm',
+                ha='center', va='bottom', fontsize=8)
+
+
+# 绘制温度趋势图
+def plot_temperature(ax, stats):
+    series = stats.series
+    _line(ax, series['日期'], series['高温'], marker='o', color=colors[0], label='高温')
+    _line(ax, series['日期'], series['低温'], marker='o', color=colors[1], label='低温')
+    _band(ax, series['日期'], series['高温'], series['低温'], color=colors[2], alpha=0.3)
+    # 各气象季节的平均高温、低温，线段限制在数据的时间范围内
+    if len(series['日期']):
+        seasonal = stats.seasonal
+        first, last = series['日期'][0], series['日期'][-1]
+        starts = np.maximum(seasonal.index.to_numpy(), first)
+        ends = np.minimum((seasonal.index + pd.DateOffset(months=3)).to_numpy(), last)
+        ax.hlines(seasonal[('高温', 'mean')], starts, ends, colors=[colors[0]], linestyles=':', label='季节平均高温')
+        ax.hlines(seasonal[('低温', 'mean')], starts, ends, colors=[colors[1]], linestyles=':', label='季节平均低温')
+    ax.set_title('温度趋势（℃）')
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m月'))
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+    ax.grid(linestyle='--', alpha=0.5)
+    ax.legend()
+
+
+# 绘制降雨量柱状图
+def plot_rainfall(ax, stats):
+    monthly = stats.monthly
+    bars = _bars(ax, monthly.index, monthly[('总降雨', 'sum')], color=colors[3], alpha=0.7, label='降雨量')
+    # 趋势线经过各柱子的中心
+    centers = [bar.get_x() + bar.get_width() / 2 for bar in bars]
+    _line(ax, centers, bars.datavalues, color=colors[4], marker='o', linestyle='--', label='趋势线')
+    ax.set_title(f'月总降雨量（mm，合计 {stats.rainfall_total:.1f}mm）')
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m月'))
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+    ax.grid(axis='y', linestyle='--', alpha=0.5)
+    _label_bars(ax, bars)
+
+
+# 绘制能见度与风速双轴图
+def plot_visibility_wind(ax, stats):
+    series = stats.series
+    color = colors[5]
+    ax.set_xlabel('月份')
+    ax.set_ylabel('能见度 (km)', color=color)
+    _line(ax, series['日期'], series['能见度'], color=color, marker='^', linestyle='--')
+    ax.tick_params(axis='y', labelcolor=color)
+    ax.grid(axis='y', linestyle='--', alpha=0.5)
+
+    ax2 = ax.twinx()
+    color = colors[6]
+    ax2.set_ylabel('风速 (km/h)', color=color)
+    _line(ax2, series['日期'], series['风速'], color=color, marker='s', linestyle='-.')
+    ax2.tick_params(axis='y', labelcolor=color)
+    ax.set_title('能见度与风速关系')
+
+
+# 绘制空气质量玫瑰图
+def plot_air_quality(ax, stats):
+    categories = stats.aqi_counts.index
+    counts = stats.aqi_counts.to_numpy()
+    theta = np.linspace(0, 2 * np.pi, len(categories), endpoint=False)
+    width = np.pi / len(categories)
+
+    rose_colors = plt.cm.viridis(np.linspace(0, 1, len(categories)))
+    bars = ax.bar(theta, counts, width=width, align='edge',
+                  color=rose_colors, alpha=0.7, edgecolor='black')
+    ax.set_theta_zero_location('N')
+    ax.set_theta_direction(-1)
+    ax.set_xticks(theta)
+    ax.set_xticklabels(categories)
+    ax.set_title('空气质量分布', y=1.08)
+
+
+# 绘制温雨复合图：按月的平均高温、低温和月内温度范围，以及月降雨量
+def plot_temp_rainfall(ax, stats):
+    monthly = stats.monthly
+    _line(ax, monthly.index, monthly[('高温', 'mean')], marker='o', color=colors[0], label='平均高温')
+    _line(ax, monthly.index, monthly[('低温', 'mean')], marker='o', color=colors[1], label='平均低温')
+    _band(ax, monthly.index, monthly[('高温', 'max')], monthly[('低温', 'min')], color=colors[2], alpha=0.3)
+    ax.set_ylabel('温度 (℃)', color=colors[1])
+    ax.tick_params(axis='y', labelcolor=colors[1])
+    ax.legend(loc='upper left')
+
+    ax2 = ax.twinx()
+    _bars(ax2, monthly.index, monthly[('总降雨', 'sum')], color=colors[3], alpha=0.3, label='降雨量')
+    ax2.set_ylabel('降雨量 (mm)', color=colors[4])
+    ax2.tick_params(axis='y', labelcolor=colors[4])
+    ax2.legend(loc='upper right')
+    ax.set_title('温度与降雨量复合分析')
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m月'))
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+
+
+# 仪表盘中各子图的绘制函数，顺序与 create_dashboard 返回的子图一致
+panels = [plot_temperature, plot_rainfall, plot_visibility_wind, plot_air_quality, plot_temp_rainfall]
+# 各子图用到的数据列，缓存键只包含这些列的数据
+panel_columns = {
+    plot_temperature: ['日期', '高温', '低温'],
+    plot_rainfall: ['日期', '总降雨'],
+    plot_visibility_wind: ['日期', '能见度', '风速'],
+    plot_air_quality: ['空气质量'],
+    plot_temp_rainfall: ['日期', '高温', '低温', '总降雨'],
+}
+
+
+def create_dashboard(fig=None):
+    """
+    创建仪表盘的画布模板，返回 (fig, axes)。
+    不传入 fig 时创建不经过 pyplot 的 Agg 画布，可在无界面的进程中反复使用。
+    """
+    if fig is None:
+        fig = Figure(figsize=figsize, dpi=100)
+        FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(3, 3)
+    axes = [
+        fig.add_subplot(grid[0, :2]),  # 温度趋势图
+        fig.add_subplot(grid[0, 2]),  # 降雨量柱状图
+        fig.add_subplot(grid[1, :2]),  # 能见度与风速双轴图
+        fig.add_subplot(grid[1, 2], projection='polar'),  # 空气质量玫瑰图
+        fig.add_subplot(grid[2, :]),  # 温雨复合图
+    ]
+    return fig, axes
+
+
+def draw_dashboard(fig, axes, data, title):
+    """
+    在画布模板上绘制一份仪表盘；上一次绘制时创建的双轴会先移除。
+    data 为观测数据或已计算好的 WeatherStats，所有子图共用同一份统计结果。
+    """
+    stats = data if isinstance(data, WeatherStats) else dashboard_stats(data)
+    for ax in fig.axes:
+        if ax not in axes:
+            fig.delaxes(ax)
+    for ax, panel in zip(axes, panels):
+        ax.clear()
+        panel(ax, stats)
+    fig.suptitle(title, fontsize=16, y=1.02)
+    # 调整布局
+    fig.tight_layout()
+
+
+def _save_jpg(image, jpg_file, dpi):
+    image.convert('RGB').save(jpg_file, 'JPEG', dpi=(dpi, dpi))
+
+
+def save_dashboard(fig, basename, dpi=300, executor=None):
+    """
+    保存为 basename.jpg 和 basename.pdf，返回两个文件名。
+    Agg 画布先渲染出位图，JPEG 编码交给线程完成（编码时不占用 GIL），
+    当前线程同时生成 PDF；其他画布依次保存。
+    """
+    options = dict(bbox_inches='tight', dpi=dpi, facecolor='white')
+    jpg_file, pdf_file = f'{basename}.jpg', f'{basename}.pdf'
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        fig.savefig(jpg_file, **options)
+        fig.savefig(pdf_file, **options)
+        return jpg_file, pdf_file
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='rgba', **options)
+    # 渲染器保留着按紧凑边界裁剪后的尺寸
+    renderer = fig.canvas.renderer
+    image = Image.frombuffer('RGBA', (int(renderer.width), int(renderer.height)),
+                             buffer.getbuffer(), 'raw', 'RGBA', 0, 1)
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        jpg = executor.submit(_save_jpg, image, jpg_file, dpi)
+        fig.savefig(pdf_file, **options)
+        jpg.result()
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return jpg_file, pdf_file
+
+
+def dashboard_style(dpi=300):
+    """影响输出结果的样式参数：rcParams（不含后端设置）、配色、画布大小、分辨率、降采样设置和 matplotlib 版本"""
+    params = {name: value for name, value in plt.rcParams.items()
+              if not name.startswith(('backend', 'interactive'))}
+    return {'rcParams': params, 'colors': colors, 'figsize': figsize, 'dpi': dpi,
+            'points_per_pixel': points_per_pixel, 'max_markers': max_markers, 'min_bar_pixels': min_bar_pixels,
+            'matplotlib': matplotlib.__version__}
+
+
+def dashboard_key(df, title, dpi=300):
+    """一份仪表盘的缓存键：每个子图的函数源码和所用数据列、布局和导出函数、标题及样式参数"""
+    parts = [title, style_digest(dashboard_style(dpi))]
+    helpers = [create_dashboard, draw_dashboard, save_dashboard, _save_jpg, _line, _band, _bars, _label_bars,
+               lttb, minmax_envelope, bin_bars, WeatherStats, summarize]
+    parts += [source_digest(func) for func in helpers]
+    for panel in panels:
+        parts += [source_digest(panel), frame_digest(df[panel_columns[panel]])]
+    return render_key(parts)
@@ -0,0 +1,244 @@
+import pandas as pd
+
+# 气象观测数据加载器：读取任意多个站点、多年的逐日或逐时观测 CSV，统一列名和类型，
+# 校验数据是否错位，并按需汇总为月度、季度（气象季节）或年度数据供仪表盘使用。
+
+# 统一后的列名及类型
+dtypes = {
+    '站点': 'category',
+    '高温': 'float32',
+    '低温': 'float32',
+    'AQI': 'float32',
+    '空气质量': 'category',
+    '能见度': 'float32',
+    '风速': 'float32',
+    '总降雨': 'float32',
+}
+measure_columns = ['高温', '低温', 'AQI', '能见度', '风速', '总降雨']
+
+# 源文件中可能出现的列名 -> 统一列名
+column_aliases = {
+    '站点': '站点', '城市': '站点', 'station': '站点',
+    '日期': '日期', '时间': '日期', 'date': '日期', 'time': '日期',
+    '月份': '月份',
+    '高温': '高温', '最高气温': '高温',
+    '低温': '低温', '最低气温': '低温',
+    '空气': '空气',
+    'AQI': 'AQI', '空气质量指数': 'AQI',
+    '空气质量': '空气质量', '空气质量等级': '空气质量',
+    '能见度': '能见度',
+    '风速': '风速',
+    '总降雨': '总降雨', '降雨': '总降雨', '降雨量': '总降雨',
+}
+
+# 各数值列的合理范围，超出范围通常意味着列错位或单位错误
+valid_ranges = {
+    '高温': (-60, 60),
+    '低温': (-60, 60),
+    'AQI': (0, 500),
+    '能见度': (0, 100),
+    '风速': (0, 200),
+    '总降雨': (0, 2000),
+}
+
+# 空气质量指数分级（HJ 633-2012）
+aqi_bins = [-1, 50, 100, 150, 200, 300, float('inf')]
+aqi_labels = ['优', '良', '轻度污染', '中度污染', '重度污染', '严重污染']
+
+number_pattern = r'(-?\d+(?:\.\d+)?)'
+month_pattern = r'(?P<year>\d{4})\s*年\s*(?P<month>\d{1,2})\s*月'
+air_pattern = r'^\s*(?P<AQI>\d+(?:\.\d+)?)\s*(?P<空气质量>\S+)?\s*$'
+
+
+def aqi_category(aqi):
+    """按空气质量指数计算空气质量等级"""
+    return pd.cut(aqi, bins=aqi_bins, labels=aqi_labels)
+
+
+def _extract_unique(series, pattern):
+    """
+    对每个不同的取值只做一次正则提取，再按编码展开回原长度。
+    观测数据中 “76 良”、“12℃” 这类文本重复率极高，比逐行提取快得多。
+    """
+    codes, uniques = pd.factorize(series)
+    extracted = pd.Series(uniques, dtype=object).astype(str).str.extract(pattern, expand=False)
+    # 缺失值的编码为 -1，对应追加的一行空值
+    extracted = pd.concat([extracted, extracted.iloc[:0].reindex([len(extracted)])])
+    result = extracted.iloc[codes].set_axis(series.index)
+    return result
+
+
+def _to_number(series):
+    """转换为数值；纯数字直接转换，带单位的文本（例如 “12℃”）用正则提取其中的数值"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float32')
+    numbers = pd.to_numeric(series, errors='coerce')
+    failed = numbers.isna() & series.notna()
+    if failed.any():
+        numbers[failed] = pd.to_numeric(_extract_unique(series[failed], number_pattern), errors='coerce')
+    return numbers.astype('float32')
+
+
+def _to_datetime(series):
+    """解析日期；先按 ISO 8601 快速解析，失败的行再逐个推断格式"""
+    dates = pd.to_datetime(series, format='ISO8601', errors='coerce')
+    failed = dates.isna() & series.notna()
+    if failed.any():
+        dates[failed] = pd.to_datetime(series[failed], format='mixed', errors='coerce')
+    return dates
+
+
+def normalize(raw, station=None):
+    """
+    把原始数据（所有列均为文本）转换为统一的列名和类型。
+
+    :param raw: pd.read_csv 读入的原始 DataFrame，文本列为字符串
+    :param station: 源数据没有站点列时使用的站点名
+    """
+    raw = raw.rename(columns={column: column_aliases[column.strip()] for column in raw.columns
+                              if column.strip() in column_aliases})
+    df = pd.DataFrame(index=raw.index)
+
+    if '站点' in raw:
+        df['站点'] = raw['站点'].str.strip()
+    else:
+        df['站点'] = station or '未知站点'
+
+    # 日期：优先使用 日期 列，其次是 “2024年01月” 形式的 月份 列
+    if '日期' in raw:
+        df['日期'] = _to_datetime(raw['日期'])
+    elif '月份' in raw:
+        parts = _extract_unique(raw['月份'], month_pattern)
+        df['日期'] = pd.to_datetime(pd.DataFrame({'year': pd.to_numeric(parts['year']),
+                                                 'month': pd.to_numeric(parts['month']),
+                                                 'day': 1}), errors='coerce')
+    else:
+        raise ValueError('缺少日期列（日期 或 月份）')
+
+    # 空气质量：“76 良” 形式的合并列，或者已拆分的 AQI / 空气质量 两列
+    if '空气' in raw:
+        air = _extract_unique(raw['空气'], air_pattern)
+        raw = raw.assign(AQI=air['AQI'], 空气质量=air['空气质量'])
+
+    for column in measure_columns:
+        if column in raw:
+            df[column] = _to_number(raw[column])
+        else:
+            df[column] = pd.Series(float('nan'), index=raw.index, dtype='float32')
+
+    if '空气质量' in raw:
+        df['空气质量'] = raw['空气质量'].str.strip().mask(lambda s: s == '')
+        missing = df['空气质量'].isna() & df['AQI'].notna()
+        df.loc[missing, '空气质量'] = aqi_category(df.loc[missing, 'AQI']).astype(object)
+    else:
+        df['空气质量'] = aqi_category(df['AQI']).astype(object)
+
+    return df.astype(dtypes)
+
+
+def validate(df, raw=None, source='数据'):
+    """
+    检查统一后的数据，发现问题时抛出 ValueError 并列出全部问题。
+    日期无法解析、低温高于高温、数值超出合理范围、必填列全部为空等情况，
+    通常说明源文件发生了列错位或列名标错。
+    """
+    problems = []
+    bad_dates = df['日期'].isna()
+    if bad_dates.any():
+        example = ''
+        if raw is not None:
+            date_column = next((c for c in raw.columns if column_aliases.get(c.strip()) in ('日期', '月份')), None)
+            if date_column is not None:
+                example = f"，例如 {raw.loc[bad_dates, date_column].iloc[0]!r}"
+        problems.append(f"{bad_dates.sum()} 行日期无法解析{example}")
+
+    for column in ('高温', '低温'):
+        if df[column].isna().all():
+            problems.append(f"{column} 列为空或不是数值")
+    if df['AQI'].isna().all() and df['空气质量'].isna().all():
+        problems.append('空气质量列为空')
+
+    inverted = df['低温'] > df['高温']
+    if inverted.any():
+        problems.append(f"{inverted.sum()} 行低温高于高温")
+
+    for column, (low, high) in valid_ranges.items():
+        out_of_range = (df[column] < low) | (df[column] > high)
+        if out_of_range.any():
+            problems.append(f"{column} 有 {out_of_range.sum()} 行超出合理范围 [{low}, {high}]")
+
+    if problems:
+        raise ValueError(f"{source} 校验失败，可能存在列错位或列名错误：\n  " + '\n  '.join(problems))
+    return df
+
+
+def load_observations(path, station=None, stations=None, years=None, chunksize=1000000):
+    """
+    分块读取观测 CSV，逐块统一列名和类型、校验并按站点和年份过滤，返回合并后的 DataFrame。
+
+    :param path: CSV 文件路径
+    :param station: 文件没有站点列时使用的站点名
+    :param stations: 只保留这些站点
+    :param years: 只保留这些年份
+    :param chunksize: 每块行数，内存中同时只保留一块原始文本
+    """
+    # 日期、站点、空气质量等文本列按字符串读入，其余列交给 CSV 解析器直接解析数值，
+    # 含单位等非数字文本的列会保留为字符串，由 normalize 再用正则提取
+    header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+    text_columns = {column: str for column in header
+                    if column_aliases.get(column.strip()) in ('站点', '日期', '月份', '空气', '空气质量')}
+    frames = []
+    for raw in pd.read_csv(path, dtype=text_columns, encoding='utf-8-sig', chunksize=chunksize, low_memory=False):
+        df = validate(normalize(raw, station), raw, source=path)
+        if stations is not None:
+            df = df[df['站点'].isin(stations)]
+        if years is not None:
+            df = df[df['日期'].dt.year.isin(years)]
+        frames.append(df)
+    if not frames:
+        return normalize(pd.DataFrame(columns=['日期']), station)
+    # 各块的 category 取值可能不同，合并后重新设置类型
+    return pd.concat(frames, ignore_index=True).astype(dtypes)
+
+
+def resample_observations(df, freq='month'):
+    """
+    按站点汇总为 hour（时）、day（日）、month（月）、season（气象季节：12-2、3-5、6-8、9-11 月）或 year（年）。
+    高温取最大值、低温取最小值、降雨量求和、其余取平均值，空气质量取期间出现最多的等级。
+    返回的 日期 列为每个时段的起始日。
+    """
+    if freq == 'hour':
+        period = df['日期'].dt.to_period('h')
+    elif freq == 'day':
+        period = df['日期'].dt.to_period('D')
+    elif freq == 'month':
+        period = df['日期'].dt.to_period('M')
+    elif freq == 'season':
+        # Q-NOV 季度以 11 月为年末，四个季度正好对应冬、春、夏、秋
+        period = df['日期'].dt.to_period('Q-NOV')
+    elif freq == 'year':
+        period = df['日期'].dt.to_period('Y')
+    else:
+        raise ValueError(f"未知的汇总频率: {freq}，可选: hour / day / month / season / year")
+
+    keys = [df['站点'], period.dt.start_time.rename('日期')]
+    grouped = df.groupby(keys, observed=True, sort=True)
+    result = grouped.agg(
+        高温=('高温', 'max'),
+        低温=('低温', 'min'),
+        AQI=('AQI', 'mean'),
+        能见度=('能见度', 'mean'),
+        风速=('风速', 'mean'),
+        总降雨=('总降雨', 'sum'),
+    )
+
+    # 每个时段出现次数最多的空气质量等级
+    counts = df.groupby(keys + [df['空气质量']], observed=True).size()
+    if len(counts):
+        mode = counts.sort_values(ascending=False, kind='stable').groupby(level=[0, 1]).head(1)
+        result['空气质量'] = mode.reset_index(level=2)['空气质量'].reindex(result.index)
+    else:
+        result['空气质量'] = None
+
+    result['AQI'] = result['AQI'].round()
+    return result.reset_index().astype(dtypes)
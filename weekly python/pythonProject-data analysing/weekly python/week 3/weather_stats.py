@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+
+from render_cache import frame_digest
+
+# 仪表盘共用的统计层：每份仪表盘只对观测数据分组汇总一次，
+# 按时间排好的观测序列、月度和季度统计、降雨量合计和空气质量等级计数交给所有子图共用，
+# 子图不再自己从观测数据中取数或分组。
+# 相同数据的统计结果保存在进程内的 LRU 缓存中，换一种布局重新绘制时直接复用。
+
+# 求最小值、最大值、平均值的列；降雨量另外求和
+measures = ['高温', '低温', 'AQI', '能见度', '风速']
+# 缓存的统计结果数量上限
+cache_size = 32
+_cache = OrderedDict()
+
+
+def summarize(frame, freq):
+    """
+    按时段汇总，返回以时段起始日为索引、列为 (列名, 统计量) 的 DataFrame。
+    freq 为 pandas 的时段频率，例如 'M'（月）、'Q-NOV'（气象季节）。
+    """
+    keys = frame['日期'].dt.to_period(freq).dt.start_time.rename('日期')
+    grouped = frame.groupby(keys, sort=True)
+    result = grouped[measures].agg(['min', 'max', 'mean'])
+    result[('总降雨', 'sum')] = grouped['总降雨'].sum()
+    return result
+
+
+class WeatherStats:
+    """
+    一份仪表盘用到的全部统计结果。各项在第一次使用时计算，之后直接返回。
+
+    frame           — 观测数据本身
+    series          — 按日期排序的观测序列，各列为 numpy 数组，用于绘制折线
+    monthly         — 月度统计
+    seasonal        — 气象季节（12-2、3-5、6-8、9-11 月）统计
+    rainfall_total  — 总降雨量合计（mm）
+    aqi_counts  — 各空气质量等级的出现次数，按等级在数据中首次出现的顺序排列
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    @cached_property
+    def series(self):
+        frame = self.frame.dropna(subset=['日期']).sort_values('日期', kind='stable')
+        result = {'日期': frame['日期'].to_numpy()}
+        for column in measures + ['总降雨']:
+            result[column] = frame[column].to_numpy(dtype=float, na_value=np.nan)
+        return result
+
+    @cached_property
+    def monthly(self):
+        return summarize(self.frame, 'M')
+
+    @cached_property
+    def seasonal(self):
+        # Q-NOV 季度以 11 月为年末，四个季度正好对应冬、春、夏、秋
+        return summarize(self.frame, 'Q-NOV')
+
+    @cached_property
+    def rainfall_total(self):
+        return float(self.frame['总降雨'].sum())
+
+    @cached_property
+    def aqi_counts(self):
+        column = self.frame['空气质量']
+        counts = column.value_counts(sort=False)
+        return counts.reindex(column.dropna().unique()).astype(int)
+
+
+def dashboard_stats(frame):
+    """返回 frame 的统计结果；内容相同的数据共用同一个 WeatherStats"""
+    key = frame_digest(frame)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    stats = WeatherStats(frame)
+    _cache[key] = stats
+    if len(_cache) > cache_size:
+        _cache.popitem(last=False)
+    return stats
@@ -0,0 +1,71 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from maze import MazeGenerator
+from maze_engines import engines, write_eller_maze
+
+# 迷宫生成算法的基准测试：各算法分别生成 size x size 的迷宫（不加难度墙），
+# 另外用 Eller 算法把 width x tall 的高迷宫逐行写入临时文件。
+# 每次生成在独立子进程中运行，报告耗时、单元格/秒和子进程的峰值内存（RSS）
+
+default_sizes = [200, 1000]
+
+
+def carve(algorithm, width, height, seed):
+    generator = MazeGenerator(width, height, algorithm=algorithm, seed=seed)
+    generator._carve_passages()
+
+
+def stream(algorithm, width, height, seed):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        write_eller_maze(os.path.join(tmp_dir, 'maze.bin'), width, height, random.Random(seed))
+
+
+def run_child(mode, algorithm, width, height, seed):
+    """在子进程中生成一个迷宫，返回 (耗时秒, 峰值 RSS MB)"""
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', mode, algorithm,
+                                str(width), str(height), '--seed', str(seed)], stdout=subprocess.PIPE, text=True)
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    if os.waitstatus_to_exitcode(status):
+        raise RuntimeError(f'生成失败: {algorithm} {width}x{height}')
+    # Linux 下 ru_maxrss 的单位是 KB
+    return float(output), usage.ru_maxrss / 1024
+
+
+def report(label, width, height, elapsed, peak_mb):
+    print(f"{label:<16}{f'{width}x{height}':<13}{elapsed:8.2f}s  {width * height / elapsed:10.0f} 单元格/秒  "
+          f"峰值内存 {peak_mb:7.1f} MB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='迷宫生成算法基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='迷宫边长（单元格数）')
+    parser.add_argument('--algorithms', nargs='+', default=list(engines), choices=list(engines), help='生成算法')
+    parser.add_argument('--stream-width', type=int, default=1000, help='Eller 逐行写文件时的迷宫宽度')
+    parser.add_argument('--stream-height', type=int, default=4000, help='Eller 逐行写文件时的迷宫高度')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--child', nargs=4, metavar=('MODE', 'ALGORITHM', 'WIDTH', 'HEIGHT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, algorithm, width, height = args.child
+        begin = time.perf_counter()
+        {'carve': carve, 'stream': stream}[mode](algorithm, int(width), int(height), args.seed)
+        print(time.perf_counter() - begin)
+        sys.exit()
+
+    _, baseline_mb = run_child('carve', 'dfs', 1, 1, args.seed)
+    print(f"解释器与导入模块的基线内存 {baseline_mb:.1f} MB")
+    for size in args.sizes:
+        for algorithm in args.algorithms:
+            report(algorithm, size, size, *run_child('carve', algorithm, size, size, args.seed))
+    report('eller stream', args.stream_width, args.stream_height,
+           *run_child('stream', 'eller', args.stream_width, args.stream_height, args.seed))
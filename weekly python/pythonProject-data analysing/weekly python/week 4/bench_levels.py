@@ -0,0 +1,57 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from maze import MazeGenerator
+from maze_cache import LevelPrefetcher, level_seed
+
+# 关卡切换的基准测试：模拟一局由小到大的多关游戏，每关“玩” --play 秒（sleep），
+# 测量切换到每一关时等待迷宫的时间：原来在关卡之间同步生成、后台预生成（缓存为空）、
+# 以及第二次用同样的种子游戏（全部命中缓存）
+
+default_sizes = [101, 201, 401, 801]
+
+
+def synchronous(specs, play):
+    waits = []
+    for spec in specs:
+        begin = time.perf_counter()
+        MazeGenerator(*spec).generate_maze()
+        waits.append(time.perf_counter() - begin)
+        time.sleep(play)
+    return waits
+
+
+def prefetched(specs, play, cache_dir):
+    waits = []
+    with LevelPrefetcher(specs, cache_dir) as prefetcher:
+        for _ in specs:
+            begin = time.perf_counter()
+            prefetcher.get()
+            waits.append(time.perf_counter() - begin)
+            time.sleep(play)
+    return waits
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='关卡切换等待时间基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='各关迷宫边长（单元格数）')
+    parser.add_argument('--difficulty', default='medium', help='迷宫难度')
+    parser.add_argument('--play', type=float, default=10.0, help='模拟每关游玩的秒数')
+    parser.add_argument('--seed', type=int, default=None, help='游戏种子，默认随机')
+    args = parser.parse_args()
+
+    game_seed = args.seed if args.seed is not None else random.randrange(1000000)
+    specs = [(size, size, args.difficulty, 'dfs', level_seed(game_seed, level))
+             for level, size in enumerate(args.sizes, start=1)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [('同步生成', synchronous(specs, args.play)),
+                   ('后台预生成', prefetched(specs, args.play, cache_dir)),
+                   ('命中缓存', prefetched(specs, args.play, cache_dir))]
+    print(f"{'':<12}" + ''.join(f"{f'{size}x{size}':>12}" for size in args.sizes) + f"{'合计':>10}")
+    for label, waits in results:
+        print(f"{label:<10}" + ''.join(f"{wait:11.3f}s" for wait in waits) + f"{sum(waits):9.3f}s")
@@ -0,0 +1,87 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from maze import MazeGenerator
+
+# 迷宫存储方式的基准测试：分别用原来的嵌套列表（list[list[int]] + list[list[bool]]）
+# 和现在的 bytearray / uint8 视图生成同样大小的迷宫（DFS 基础结构，不加难度墙），
+# 每次生成在独立子进程中运行，报告耗时、单元格/秒和子进程的峰值内存（RSS）
+
+default_sizes = [200, 1000, 2000]
+
+
+def list_carve(width, height):
+    """原来的存储方式：嵌套列表保存迷宫和访问标记，生成步骤与 MazeGenerator 相同"""
+    maze = [[1] * (2 * width + 1) for _ in range(2 * height + 1)]
+    visited = [[False] * width for _ in range(height)]
+    start_x = random.randint(0, width - 1)
+    start_y = random.randint(0, height - 1)
+    stack = [(start_x, start_y)]
+    visited[start_y][start_x] = True
+    maze[2 * start_y + 1][2 * start_x + 1] = 0
+    while stack:
+        x, y = stack[-1]
+        neighbors = []
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and not visited[ny][nx]:
+                neighbors.append((nx, ny))
+        if neighbors:
+            nx, ny = random.choice(neighbors)
+            maze[2 * y + 1 + (ny - y)][2 * x + 1 + (nx - x)] = 0
+            maze[2 * ny + 1][2 * nx + 1] = 0
+            visited[ny][nx] = True
+            stack.append((nx, ny))
+        else:
+            stack.pop()
+    return maze
+
+
+def array_carve(width, height):
+    generator = MazeGenerator(width, height)
+    generator._carve_passages()
+    return generator.maze
+
+
+carvers = {'list': list_carve, 'array': array_carve}
+
+
+def run_child(storage, size, seed):
+    """在子进程中生成一个迷宫，返回 (耗时秒, 峰值 RSS MB)"""
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', storage,
+                                '--sizes', str(size), '--seed', str(seed)], stdout=subprocess.PIPE, text=True)
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    if os.waitstatus_to_exitcode(status):
+        raise RuntimeError(f'生成失败: {storage} {size}')
+    # Linux 下 ru_maxrss 的单位是 KB
+    return float(output), usage.ru_maxrss / 1024
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='迷宫存储方式基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='迷宫边长（单元格数）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--child', choices=list(carvers), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        random.seed(args.seed)
+        begin = time.perf_counter()
+        carvers[args.child](args.sizes[0], args.sizes[0])
+        print(time.perf_counter() - begin)
+        sys.exit()
+
+    _, baseline_mb = run_child('array', 1, args.seed)
+    print(f"解释器与导入模块的基线内存 {baseline_mb:.1f} MB")
+    for size in args.sizes:
+        for storage in carvers:
+            elapsed, peak_mb = run_child(storage, size, args.seed)
+            print(f"{size}x{size} {storage:<6} {elapsed:8.2f}s  {size * size / elapsed:10.0f} 单元格/秒  "
+                  f"峰值内存 {peak_mb:7.1f} MB")
@@ -0,0 +1,78 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from maze import MazeGenerator
+from maze_solver import bfs
+from maze_view import MazeView
+
+# 迷宫绘制的基准测试：沿入口到出口的最短路径走完整个迷宫（无窗口），
+# 比较原来每帧用 pygame.draw.rect 重画所有墙壁的做法和现在缓存迷宫画面、只更新变化矩形的做法。
+# 原来的做法只能显示整个迷宫，窗口随迷宫变大；现在的视口不超过 maze_view.max_view_size
+
+default_sizes = [21, 51, 101, 501]
+cell_size = 20
+
+
+def redraw_all(maze, entrance, exit, path):
+    """原来的绘制方式：每帧清屏并逐个画出所有墙壁，返回平均每帧秒数"""
+    screen = pygame.display.set_mode((len(maze[0]) * cell_size, len(maze) * cell_size))
+    begin = time.perf_counter()
+    for player_pos in path:
+        screen.fill((255, 255, 255))
+        for y in range(len(maze)):
+            for x in range(len(maze[0])):
+                if maze[y][x] == 1:
+                    pygame.draw.rect(screen, (0, 0, 0), (x * cell_size, y * cell_size, cell_size, cell_size))
+        pygame.draw.rect(screen, (0, 255, 0), (entrance[0] * cell_size, entrance[1] * cell_size, cell_size, cell_size))
+        pygame.draw.rect(screen, (255, 0, 0), (exit[0] * cell_size, exit[1] * cell_size, cell_size, cell_size))
+        pygame.draw.rect(screen, (0, 0, 255),
+                         (player_pos[0] * cell_size, player_pos[1] * cell_size, cell_size, cell_size))
+        pygame.display.flip()
+    return (time.perf_counter() - begin) / len(path)
+
+
+def cached_view(maze, entrance, exit, path):
+    """现在的绘制方式，返回 (平均每帧秒数, 生成迷宫画面的秒数, 视口移动的帧数)"""
+    begin = time.perf_counter()
+    view = MazeView(maze, entrance, exit, cell_size)
+    setup = time.perf_counter() - begin
+    screen = pygame.display.set_mode(view.window_size)
+    screen.fill((255, 255, 255))
+    scrolls = 0
+    begin = time.perf_counter()
+    for player_pos in path:
+        dirty = view.draw(screen, player_pos)
+        scrolls += any(rect.size == view.size for rect in dirty)
+        pygame.display.update(dirty)
+    return (time.perf_counter() - begin) / len(path), setup, scrolls
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='迷宫绘制基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='迷宫边长（单元格数）')
+    parser.add_argument('--legacy-max', type=int, default=101, help='原来的做法只测到这个边长')
+    parser.add_argument('--legacy-frames', type=int, default=30, help='原来的做法只测最短路径的前几帧')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    pygame.init()
+    print(f"{'迷宫':<11}{'帧数':>7}{'原来/帧':>11}{'现在/帧':>11}{'生成画面':>10}{'滚动帧':>8}")
+    for size in args.sizes:
+        generator = MazeGenerator(size, size, 'easy', seed=args.seed)
+        maze = generator.generate_maze()
+        path = bfs(maze, generator.entrance, generator.exit)
+        if path is None:
+            print(f"{size}x{size} 入口和出口不连通，跳过")
+            continue
+        frame, setup, scrolls = cached_view(maze, generator.entrance, generator.exit, path)
+        legacy = '-'
+        if size <= args.legacy_max:
+            legacy = f"{redraw_all(maze, generator.entrance, generator.exit, path[:args.legacy_frames]) * 1000:.2f}ms"
+        print(f"{f'{size}x{size}':<11}{len(path):>7}{legacy:>11}{frame * 1000:9.3f}ms{setup * 1000:8.1f}ms{scrolls:>8}")
+    pygame.quit()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from maze import MazeGenerator
+from maze_solver import astar, bfs, bidirectional_bfs, direction_field, distance_field, hint
+
+# 迷宫求解的基准测试：对不同边长的迷宫分别用 BFS、双向 BFS、A* 求入口到出口的最短路径，
+# 再计算出口的距离场和方向场，测量每秒能给出的提示次数。
+# 入口和出口在第 height 行，height 为偶数时入口常常不连通，所以默认使用奇数边长
+
+# 2001x2001 用来验证 distance_field 文档中“2001x2001 单元格的迷宫也只需几秒”的说法
+default_sizes = [201, 1001, 2001]
+
+
+def timed(function, *args):
+    begin = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - begin
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='迷宫求解基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='迷宫边长（单元格数）')
+    parser.add_argument('--algorithm', default='dfs', help='迷宫生成算法')
+    parser.add_argument('--difficulty', default='medium', help='迷宫难度')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--hints', type=int, default=100000, help='测量提示速度时的提示次数')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        generator = MazeGenerator(size, size, args.difficulty, args.algorithm, args.seed)
+        maze = generator.generate_maze()
+        entrance, exit = generator.entrance, generator.exit
+        print(f"{size}x{size}（迷宫数组 {maze.shape[1]}x{maze.shape[0]}，{maze.size} 格）")
+
+        lengths = set()
+        for name, solver in (('BFS', bfs), ('双向 BFS', bidirectional_bfs), ('A*', astar)):
+            path, elapsed = timed(solver, maze, entrance, exit)
+            lengths.add(None if path is None else len(path) - 1)
+            print(f"  {name:<10}{elapsed:8.3f}s")
+        if len(lengths) != 1:
+            raise RuntimeError(f'各算法的最短路径长度不一致: {lengths}')
+
+        distances, field_elapsed = timed(distance_field, maze, exit)
+        steps, steps_elapsed = timed(direction_field, distances)
+        print(f"  {'距离场':<10}{field_elapsed:8.3f}s  方向场 {steps_elapsed:.3f}s  "
+              f"最短步数 {distances[entrance[1], entrance[0]]}")
+
+        begin = time.perf_counter()
+        for _ in range(args.hints):
+            hint(steps, entrance)
+        print(f"  {'提示':<10}{args.hints / (time.perf_counter() - begin):8.0f} 次/秒")
@@ -0,0 +1,82 @@
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from maze import MazeGenerator
+
+# 难度加墙的基准测试：对不同边长和难度的迷宫，比较原来“每个候选墙复制整个迷宫再 BFS”的做法
+# 和现在按入口到出口路径增量判断的做法，两者使用相同的随机种子，结果必须完全相同
+
+# 入口和出口在第 height 行；height 为偶数时这是一行墙位，入口常常与迷宫不连通而一面墙都加不了，
+# 所以默认使用奇数边长
+default_sizes = [21, 41, 201, 1001]
+difficulties = ['easy', 'medium', 'hard']
+
+
+def copy_and_check(generator):
+    """原来的加墙方式：每个候选墙都复制整个迷宫并用 BFS 检查入口和出口是否仍然连通"""
+    cells, cols = generator.cells, generator.cols
+    for y in range(1, 2 * generator.height, 2):
+        for x in range(1, 2 * generator.width, 2):
+            if random.random() < generator.wall_probability:
+                i = y * cols + x
+                candidates = []
+                if y > 1 and cells[i - cols] == 0:
+                    candidates.append(i - cols)
+                if y < 2 * generator.height - 1 and cells[i + cols] == 0:
+                    candidates.append(i + cols)
+                if x > 1 and cells[i - 1] == 0:
+                    candidates.append(i - 1)
+                if x < 2 * generator.width - 1 and cells[i + 1] == 0:
+                    candidates.append(i + 1)
+                for wall in candidates:
+                    temp_cells = bytearray(cells)
+                    temp_cells[wall] = 1
+                    if generator._find_path(temp_cells, generator.entrance, generator.exit) is not None:
+                        cells[wall] = 1
+
+
+def carved(size, difficulty, seed):
+    """生成打通单元格并设置好入口出口、尚未加墙的迷宫"""
+    random.seed(seed)
+    generator = MazeGenerator(size, size, difficulty)
+    generator.set_difficulty()
+    generator._carve_passages()
+    mid_y = 2 * generator.height // 2
+    generator.entrance = (0, mid_y)
+    generator.exit = (2 * generator.width, mid_y)
+    generator.cells[mid_y * generator.cols] = 0
+    generator.cells[mid_y * generator.cols + 2 * generator.width] = 0
+    return generator
+
+
+def measure(size, difficulty, seed, add_walls):
+    generator = carved(size, difficulty, seed)
+    before = generator.cells.count(1)
+    begin = time.perf_counter()
+    add_walls(generator)
+    return time.perf_counter() - begin, generator.cells.count(1) - before, bytes(generator.cells)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='难度加墙基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='迷宫边长（单元格数）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--legacy-max', type=int, default=41, help='原来的做法只测到这个边长，更大的迷宫耗时过长')
+    args = parser.parse_args()
+
+    print(f"{'迷宫':<11}{'难度':<8}{'加墙数':>8}{'原来':>10}{'增量':>10}{'加速':>9}")
+    for size in args.sizes:
+        for difficulty in difficulties:
+            elapsed, added, result = measure(size, difficulty, args.seed, MazeGenerator._add_random_walls)
+            line = f"{f'{size}x{size}':<11}{difficulty:<8}{added:>8}"
+            if size <= args.legacy_max:
+                legacy_elapsed, _, legacy_result = measure(size, difficulty, args.seed, copy_and_check)
+                if legacy_result != result:
+                    raise RuntimeError(f'结果不一致: {size}x{size} {difficulty}')
+                print(f"{line}{legacy_elapsed:9.3f}s{elapsed:9.3f}s{legacy_elapsed / elapsed:8.0f}x")
+            else:
+                print(f"{line}{'-':>10}{elapsed:9.3f}s")
@@ -1,16 +1,33 @@
 import random
-import pygame
+from array import array
 from collections import deque
 
+import numpy as np
+import pygame
+
+from maze_engines import engines
+from maze_view import MazeView
+
 
 class MazeGenerator:
-    def __init__(self, width, height, difficulty='medium'):
+    def __init__(self, width, height, difficulty='medium', algorithm='dfs', seed=None):
         self.width = width
         self.height = height
         # 调整迷宫数组维度为 (2h+1) x (2w+1)
-        self.maze = [[1] * (2 * width + 1) for _ in range(2 * height + 1)]
-        self.visited = [[False] * width for _ in range(height)]
+        self.rows = 2 * height + 1
+        self.cols = 2 * width + 1
+        # 迷宫保存在一块连续的 bytearray 中（每格 1 字节，1 为墙、0 为通路），按行展开成一维；
+        # self.maze 是它的 (2h+1) x (2w+1) uint8 NumPy 视图，两者共享同一块内存。
+        # 生成算法直接用一维下标读写 bytearray，比逐格访问 NumPy 标量或嵌套列表都快。
+        self.cells = bytearray(b'\x01') * (self.rows * self.cols)
+        self.maze = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
         self.difficulty = difficulty
+        # 生成算法：'dfs'、'kruskal'、'wilson' 或 'eller'，见 maze_engines.py
+        if algorithm not in engines:
+            raise ValueError(f"未知的迷宫生成算法: {algorithm}")
+        self.algorithm = algorithm
+        # 给定 seed 时使用独立的随机数生成器，同样的种子得到同样的迷宫；否则使用 random 模块的全局状态
+        self.random = random.Random(seed) if seed is not None else random
         self.entrance = None
         self.exit = None
 
@@ -24,105 +41,95 @@ class MazeGenerator:
 
     def generate_maze(self):
         self.set_difficulty()
-        # 初始化随机起点
-        start_x = random.randint(0, self.width - 1)
-        start_y = random.randint(0, self.height - 1)
-
-        # 使用DFS生成迷宫基础结构
-        stack = [(start_x, start_y)]
-        self.visited[start_y][start_x] = True
-        self.maze[2 * start_y + 1][2 * start_x + 1] = 0
-
-        while stack:
-            x, y = stack[-1]
-            neighbors = self._get_unvisited_neighbors(x, y)
-
-            if neighbors:
-                nx, ny = random.choice(neighbors)
-                # 打通当前单元格与邻居之间的墙
-                self.maze[2 * y + 1 + (ny - y)][2 * x + 1 + (nx - x)] = 0
-                self.maze[2 * ny + 1][2 * nx + 1] = 0
-                self.visited[ny][nx] = True
-                stack.append((nx, ny))
-            else:
-                stack.pop()
+        self._carve_passages()
 
         # 设置入口和出口（关键修改）
         mid_y = 2 * self.height // 2  # 垂直方向中间位置（因为数组长度是2h+1）
+        # 注意：height 为偶数时 mid_y 是一行墙位，入口旁的格子未必打通，此时入口和出口不连通、也不会再加墙
         self.entrance = (0, mid_y)  # 左边界中间
         self.exit = (2 * self.width, mid_y)  # 右边界中间
 
         # 确保入口出口是通路
-        self.maze[mid_y][0] = 0
-        self.maze[mid_y][2 * self.width] = 0
+        self.cells[mid_y * self.cols] = 0
+        self.cells[mid_y * self.cols + 2 * self.width] = 0
 
         # 根据难度添加随机墙壁
         self._add_random_walls()
 
         return self.maze
 
-    def _get_unvisited_neighbors(self, x, y):
-        """获取未访问的相邻单元格"""
-        neighbors = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.width and 0 <= ny < self.height:
-                if not self.visited[ny][nx]:
-                    neighbors.append((nx, ny))
-        return neighbors
+    def _carve_passages(self):
+        """用选定的算法打通各单元格，生成迷宫基础结构"""
+        engines[self.algorithm](self.cells, self.width, self.height, self.random)
 
     def _add_random_walls(self):
-        """根据难度添加额外墙壁"""
+        """
+        根据难度添加额外墙壁，加墙后入口和出口仍然连通。
+        只记录一条入口到出口的路径：不在路径上的墙位加墙后这条路径仍在，可以直接加；
+        各生成算法得到的都是完美迷宫（任意两格之间只有一条路），路径上的墙位必然断开入口和出口，直接跳过。
+        """
+        cells, cols = self.cells, self.cols
+        on_path = bytearray(len(cells))
+        path = self._find_path(cells, self.entrance, self.exit)
+        for i in path or ():
+            on_path[i] = 1
+
         for y in range(1, 2 * self.height, 2):
             for x in range(1, 2 * self.width, 2):
-                if random.random() < self.wall_probability:
+                if self.random.random() < self.wall_probability:
+                    i = y * cols + x
                     candidates = []
                     # 检查上下左右可能的墙壁位置
-                    if y > 1 and self.maze[y - 1][x] == 0:
-                        candidates.append((y - 1, x))
-                    if y < 2 * self.height - 1 and self.maze[y + 1][x] == 0:
-                        candidates.append((y + 1, x))
-                    if x > 1 and self.maze[y][x - 1] == 0:
-                        candidates.append((y, x - 1))
-                    if x < 2 * self.width - 1 and self.maze[y][x + 1] == 0:
-                        candidates.append((y, x + 1))
-
-                    for candidate in candidates:
-                        wy, wx = candidate
-                        # 临时添加墙壁
-                        temp_maze = [row[:] for row in self.maze]
-                        temp_maze[wy][wx] = 1
-                        # 检查添加墙壁后是否仍然连通
-                        if self._is_connected(temp_maze, self.entrance, self.exit):
-                            self.maze[wy][wx] = 1
-
-    def _is_connected(self, maze, start, end):
-        """检查从起点到终点是否连通"""
+                    if y > 1 and cells[i - cols] == 0:
+                        candidates.append(i - cols)
+                    if y < 2 * self.height - 1 and cells[i + cols] == 0:
+                        candidates.append(i + cols)
+                    if x > 1 and cells[i - 1] == 0:
+                        candidates.append(i - 1)
+                    if x < 2 * self.width - 1 and cells[i + 1] == 0:
+                        candidates.append(i + 1)
+
+                    for wall in candidates:
+                        if path is None:
+                            # 入口和出口本来就不连通，与逐个检查时一样不加墙
+                            break
+                        if not on_path[wall]:
+                            cells[wall] = 1
+
+    def _find_path(self, cells, start, end):
+        """用 BFS 寻找从起点到终点的一条最短路径，返回路径上各格的一维下标；不连通时返回 None"""
+        cols = self.cols
+        start = start[1] * cols + start[0]
+        end = end[1] * cols + end[0]
         queue = deque([start])
-        visited = set()
-        visited.add(start)
+        parent = array('i', [-1]) * len(cells)
+        parent[start] = start
 
         while queue:
-            x, y = queue.popleft()
-            if (x, y) == end:
-                return True
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in visited:
-                    queue.append((nx, ny))
-                    visited.add((nx, ny))
-        return False
+            i = queue.popleft()
+            if i == end:
+                path = [i]
+                while i != start:
+                    i = parent[i]
+                    path.append(i)
+                return path[::-1]
+            column = i % cols
+            for j in (i - 1 if column > 0 else -1, i + 1 if column < cols - 1 else -1, i - cols, i + cols):
+                if 0 <= j < len(cells) and cells[j] == 0 and parent[j] < 0:
+                    queue.append(j)
+                    parent[j] = i
+        return None
 
 
 def play_maze(maze, entrance, exit):
     pygame.init()
     CELL_SIZE = 20
-    WINDOW_SIZE = (len(maze[0]) * CELL_SIZE, len(maze) * CELL_SIZE)
+    # 迷宫画面只生成一次，窗口过小时跟随玩家滚动
+    view = MazeView(maze, entrance, exit, CELL_SIZE)
 
-    screen = pygame.display.set_mode(WINDOW_SIZE)
+    screen = pygame.display.set_mode(view.window_size)
     pygame.display.set_caption("Maze Game")
+    screen.fill((255, 255, 255))
 
     # 初始化玩家位置（入口坐标转换）
     player_pos = [entrance[0], entrance[1]]
@@ -135,6 +142,8 @@ def play_maze(maze, entrance, exit):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                view.invalidate()
 
         # 处理键盘输入
         keys = pygame.key.get_pressed()
@@ -158,27 +167,8 @@ def play_maze(maze, entrance, exit):
             game_won = True
             running = False
 
-        # 绘制界面
-        screen.fill((255, 255, 255))
-
-        # 绘制迷宫
-        for y in range(len(maze)):
-            for x in range(len(maze[0])):
-                if maze[y][x] == 1:
-                    pygame.draw.rect(screen, (0, 0, 0),
-                                     (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-        # 绘制入口（绿色）和出口（红色）
-        pygame.draw.rect(screen, (0, 255, 0),
-                         (entrance[0] * CELL_SIZE, entrance[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-        pygame.draw.rect(screen, (255, 0, 0),
-                         (exit[0] * CELL_SIZE, exit[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-        # 绘制玩家（蓝色）
-        pygame.draw.rect(screen, (0, 0, 255),
-                         (player_pos[0] * CELL_SIZE, player_pos[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-        pygame.display.flip()
+        # 只重画有变化的部分：视口移动时整个视口，否则只有玩家移动前后的格子
+        pygame.display.update(view.draw(screen, player_pos))
         clock.tick(30)
 
     pygame.quit()
@@ -190,8 +180,9 @@ if __name__ == "__main__":
     WIDTH = 10
     HEIGHT = 10
     DIFFICULTY = 'medium'
+    ALGORITHM = 'dfs'  # 'dfs'、'kruskal'、'wilson' 或 'eller'
 
-    generator = MazeGenerator(WIDTH, HEIGHT, DIFFICULTY)
+    generator = MazeGenerator(WIDTH, HEIGHT, DIFFICULTY, ALGORITHM)
     maze = generator.generate_maze()
 
     # 验证入口出口坐标有效性
@@ -0,0 +1,159 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+
+import maze
+import maze_engines
+from maze import MazeGenerator
+
+# 生成好的迷宫保存在磁盘缓存中，按 (宽, 高, 难度, 算法, 种子) 寻址，同样的关卡不会再生成第二次；
+# 生成代码（maze.py、maze_engines.py）修改后缓存文件名随之改变，旧的迷宫不会被误用。
+# LevelPrefetcher 在后台进程中提前生成后面的关卡并写入缓存，再通过队列把关卡交给游戏，
+# 切换关卡时只需从缓存读取。
+
+# 迷宫缓存目录的默认最大容量（字节）
+default_max_bytes = 200 * 1024 * 1024
+
+
+def generator_digest():
+    """生成代码的哈希"""
+    digest = hashlib.sha256()
+    for module in (maze, maze_engines):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def level_seed(game_seed, level):
+    """一局游戏中第 level 关的种子，同一局种子的各关迷宫固定"""
+    return game_seed * 1000 + level
+
+
+class MazeCache:
+    """
+    迷宫的磁盘缓存，每个迷宫一个压缩的 .npz 文件（迷宫数组、入口、出口）。
+    文件先写临时文件再替换，多个进程可以同时使用同一缓存目录；读取时刷新修改时间，淘汰时按它排序。
+    """
+
+    def __init__(self, cache_dir='maze_cache', max_bytes=default_max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.digest = generator_digest()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, width, height, difficulty, algorithm, seed):
+        name = f'{width}x{height}_{difficulty}_{algorithm}_{seed}_{self.digest}.npz'
+        return os.path.join(self.cache_dir, name)
+
+    def load(self, width, height, difficulty, algorithm, seed):
+        """返回缓存的 (迷宫数组, 入口, 出口)，没有缓存时返回 None"""
+        path = self.path(width, height, difficulty, algorithm, seed)
+        try:
+            with np.load(path) as data:
+                result = data['maze'], tuple(data['entrance'].tolist()), tuple(data['exit'].tolist())
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        return result
+
+    def store(self, width, height, difficulty, algorithm, seed, generator):
+        """保存刚生成的迷宫"""
+        path = self.path(width, height, difficulty, algorithm, seed)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, maze=generator.maze, entrance=np.array(generator.entrance),
+                                exit=np.array(generator.exit))
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """总大小超过上限时按最近使用时间从旧到新删除迷宫"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            removed += 1
+        return removed
+
+
+def generate_level(cache, width, height, difficulty, algorithm, seed):
+    """从缓存读取关卡，没有缓存时生成并保存；返回 (迷宫数组, 入口, 出口)"""
+    level = cache.load(width, height, difficulty, algorithm, seed)
+    if level is None:
+        generator = MazeGenerator(width, height, difficulty, algorithm, seed)
+        generator.generate_maze()
+        cache.store(width, height, difficulty, algorithm, seed, generator)
+        level = generator.maze, generator.entrance, generator.exit
+    return level
+
+
+def _prefetch(levels, cache_dir, handoff):
+    """后台进程：按顺序确保每一关都在缓存中，然后把关卡参数放入队列；出错时放入错误信息"""
+    try:
+        cache = MazeCache(cache_dir)
+        for spec in levels:
+            generate_level(cache, *spec)
+            handoff.put(spec)
+        cache.evict()
+    except Exception as e:
+        handoff.put(f'{type(e).__name__}: {e}')
+
+
+class LevelPrefetcher:
+    """
+    在后台进程中提前生成 levels 中的各关，最多领先 ahead 关。
+    levels 的每一项为 (宽, 高, 难度, 算法, 种子)，get() 按顺序返回各关的 (迷宫数组, 入口, 出口)。
+    """
+
+    def __init__(self, levels, cache_dir='maze_cache', ahead=2):
+        self.cache = MazeCache(cache_dir)
+        self.waited = 0.0  # 切换关卡时等待后台生成的总秒数
+        self.handoff = multiprocessing.Queue(maxsize=ahead)
+        self.process = multiprocessing.Process(target=_prefetch, args=(list(levels), cache_dir, self.handoff),
+                                               daemon=True)
+        self.process.start()
+
+    def get(self):
+        """返回下一关；后台还没有生成好时等待"""
+        begin = time.perf_counter()
+        while True:
+            try:
+                spec = self.handoff.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    # 后台进程可能在超时之后、检查之前放入最后一关并退出，退出前放入的数据已在队列中
+                    try:
+                        spec = self.handoff.get_nowait()
+                        break
+                    except queue.Empty:
+                        raise RuntimeError('后台生成关卡的进程已退出') from None
+        self.waited += time.perf_counter() - begin
+        if isinstance(spec, str):
+            raise RuntimeError(f'后台生成关卡失败: {spec}')
+        # 缓存文件可能已被其他进程淘汰，此时在当前进程中重新生成
+        return generate_level(self.cache, *spec)
+
+    def close(self):
+        """结束后台进程"""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,202 @@
+from array import array
+
+# 迷宫生成算法。每个算法都在按行展开的迷宫数组（bytearray，(2h+1) x (2w+1)，1 为墙、0 为通路）上
+# 打通 width x height 个单元格，生成完美迷宫（生成树，任意两格之间只有一条路）。
+# rng 可以是 random 模块本身或 random.Random 实例，同样的种子得到同样的迷宫。
+# Eller 算法另外提供逐行生成的 eller_rows，内存只与宽度有关，可以把任意高的迷宫直接写到文件。
+
+
+def cell_index(cell, width, cols):
+    """单元格编号 y * width + x 在迷宫数组中的一维下标"""
+    return (2 * (cell // width) + 1) * cols + 2 * (cell % width) + 1
+
+
+def carve_dfs(cells, width, height, rng):
+    """DFS（递归回溯），用显式栈代替递归"""
+    cols = 2 * width + 1
+    count = width * height
+    visited = bytearray(count)
+    # 初始化随机起点
+    start_x = rng.randint(0, width - 1)
+    start_y = rng.randint(0, height - 1)
+
+    # 栈中保存单元格编号 y * width + x，用 array 存放比元组列表省内存
+    stack = array('i', [start_y * width + start_x])
+    visited[start_y * width + start_x] = 1
+    cells[(2 * start_y + 1) * cols + 2 * start_x + 1] = 0
+    choice = rng.choice
+
+    while stack:
+        cell = stack[-1]
+        x = cell % width
+        # 未访问的相邻单元格，顺序为左、右、上、下
+        neighbors = []
+        if x > 0 and not visited[cell - 1]:
+            neighbors.append(cell - 1)
+        if x < width - 1 and not visited[cell + 1]:
+            neighbors.append(cell + 1)
+        if cell >= width and not visited[cell - width]:
+            neighbors.append(cell - width)
+        if cell + width < count and not visited[cell + width]:
+            neighbors.append(cell + width)
+
+        if neighbors:
+            neighbor = choice(neighbors)
+            # 打通当前单元格与邻居之间的墙，墙位于两格在迷宫数组中位置的正中间
+            here = (2 * (cell // width) + 1) * cols + 2 * x + 1
+            there = cell_index(neighbor, width, cols)
+            cells[(here + there) // 2] = 0
+            cells[there] = 0
+            visited[neighbor] = 1
+            stack.append(neighbor)
+        else:
+            stack.pop()
+
+
+def carve_kruskal(cells, width, height, rng):
+    """随机 Kruskal：打乱所有内墙，依次拆掉两侧尚不连通的墙，连通关系用并查集维护"""
+    cols = 2 * width + 1
+    count = width * height
+    for cell in range(count):
+        cells[cell_index(cell, width, cols)] = 0
+
+    # 内墙编号为 cell * 2 + 方向，方向 0 为右侧的墙，1 为下方的墙
+    walls = array('i', (cell * 2 for cell in range(count) if cell % width < width - 1))
+    walls.extend(cell * 2 + 1 for cell in range(count - width))
+    rng.shuffle(walls)
+
+    parent = array('i', range(count))
+
+    def find(cell):
+        # 路径减半
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    remaining = count - 1
+    for wall in walls:
+        cell, direction = divmod(wall, 2)
+        neighbor = cell + width if direction else cell + 1
+        a, b = find(cell), find(neighbor)
+        if a != b:
+            parent[a] = b
+            cells[(cell_index(cell, width, cols) + cell_index(neighbor, width, cols)) // 2] = 0
+            remaining -= 1
+            if not remaining:
+                break
+
+
+def carve_wilson(cells, width, height, rng):
+    """Wilson 算法：从未加入迷宫的单元格随机游走到已加入的部分，擦除游走中的环后整条路径加入迷宫，
+    得到的是所有生成树中均匀随机的一棵"""
+    cols = 2 * width + 1
+    count = width * height
+    in_maze = bytearray(count)
+    # 游走时每个单元格最后一次离开的方向（下一格的编号），后来的记录覆盖之前的，相当于擦除了环
+    next_cell = array('i', [-1]) * count
+    first = rng.randrange(count)
+    in_maze[first] = 1
+    cells[cell_index(first, width, cols)] = 0
+    choice = rng.choice
+
+    for start in range(count):
+        if in_maze[start]:
+            continue
+        cell = start
+        while not in_maze[cell]:
+            x = cell % width
+            neighbors = []
+            if x > 0:
+                neighbors.append(cell - 1)
+            if x < width - 1:
+                neighbors.append(cell + 1)
+            if cell >= width:
+                neighbors.append(cell - width)
+            if cell + width < count:
+                neighbors.append(cell + width)
+            next_cell[cell] = choice(neighbors)
+            cell = next_cell[cell]
+
+        # 沿记录的方向从起点走到迷宫，打通沿途的墙
+        cell = start
+        while not in_maze[cell]:
+            in_maze[cell] = 1
+            here = cell_index(cell, width, cols)
+            there = cell_index(next_cell[cell], width, cols)
+            cells[here] = 0
+            cells[(here + there) // 2] = 0
+            cell = next_cell[cell]
+
+
+def eller_rows(width, height, rng):
+    """
+    Eller 算法逐行生成迷宫，依次产生迷宫数组的 2h+1 行（每行 2w+1 字节的 bytes）。
+    只保存当前一行单元格所属的集合，内存与高度无关。
+    """
+    cols = 2 * width + 1
+    yield bytes(b'\x01') * cols
+    # sets[x] 为当前行第 x 格所属集合的编号，members 为各集合在当前行的格子
+    sets = list(range(width))
+    members = {x: [x] for x in range(width)}
+    next_set = width
+
+    for y in range(height):
+        last = y == height - 1
+        row = bytearray(b'\x01') * cols
+        row[1:cols - 1:2] = bytes(width)
+        # 随机合并相邻且不在同一集合的格子；最后一行必须全部合并
+        for x in range(width - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last or rng.random() < 0.5):
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for column in members.pop(b):
+                    sets[column] = a
+                    members[a].append(column)
+                row[2 * x + 2] = 0
+        yield bytes(row)
+        if last:
+            break
+
+        # 每个集合至少有一格向下打通，向下打通的格子在下一行保留原来的集合，其余格子成为新集合
+        below = bytearray(b'\x01') * cols
+        down = [rng.random() < 0.5 for _ in range(width)]
+        for columns in members.values():
+            if not any(down[column] for column in columns):
+                down[rng.choice(columns)] = True
+        members = {}
+        for x in range(width):
+            if down[x]:
+                below[2 * x + 1] = 0
+            else:
+                sets[x] = next_set
+                next_set += 1
+            members.setdefault(sets[x], []).append(x)
+        yield bytes(below)
+    yield bytes(b'\x01') * cols
+
+
+def carve_eller(cells, width, height, rng):
+    """Eller 算法，把逐行生成的结果写入迷宫数组"""
+    cols = 2 * width + 1
+    for y, row in enumerate(eller_rows(width, height, rng)):
+        cells[y * cols:(y + 1) * cols] = row
+
+
+def write_eller_maze(path, width, height, rng):
+    """
+    把 Eller 算法生成的迷宫逐行写到文件，每格 1 字节，不在内存中保存整个迷宫。
+    读取时可以用 numpy.memmap(path, dtype=numpy.uint8).reshape(-1, 2 * width + 1)。
+    """
+    with open(path, 'wb') as f:
+        for row in eller_rows(width, height, rng):
+            f.write(row)
+
+
+engines = {
+    'dfs': carve_dfs,
+    'kruskal': carve_kruskal,
+    'wilson': carve_wilson,
+    'eller': carve_eller,
+}
@@ -0,0 +1,203 @@
+import heapq
+from array import array
+
+import numpy as np
+
+# 迷宫求解：在迷宫数组（1 为墙、0 为通路，嵌套列表或 NumPy 数组均可）上用 BFS、双向 BFS 或 A* 求最短路径，
+# 坐标与 MazeGenerator 的入口、出口相同，为 (x, y)。
+# distance_field 对每个迷宫只算一次从终点出发的距离场，之后的提示、最短步数和得分都是 O(1) 查表。
+# 内部把迷宫四周补一圈墙后按行展开成 bytes，相邻格的一维下标只差 ±1 或 ±一行的长度，不需要检查边界。
+
+# 方向编号：上、下、左、右，对应 (dx, dy)
+directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+# 距离场中墙和到不了终点的格子
+unreachable = -1
+
+
+def _padded(maze):
+    """返回补墙后按行展开的迷宫 bytearray 和补墙后每行的长度"""
+    grid = np.asarray(maze, dtype=np.uint8)
+    return bytearray(np.pad(grid, 1, constant_values=1).tobytes()), grid.shape[1] + 2
+
+
+def _index(position, stride):
+    return (position[1] + 1) * stride + position[0] + 1
+
+
+def _position(index, stride):
+    y, x = divmod(index, stride)
+    return x - 1, y - 1
+
+
+def _trace(parent, end, stride):
+    """沿 parent 从终点回溯到起点（起点的 parent 是它自己），返回 (x, y) 路径"""
+    path = [end]
+    while parent[path[-1]] != path[-1]:
+        path.append(parent[path[-1]])
+    return [_position(index, stride) for index in reversed(path)]
+
+
+def bfs(maze, start, end):
+    """BFS 求最短路径，返回从 start 到 end 的 (x, y) 列表；不连通时返回 None"""
+    cells, stride = _padded(maze)
+    start, end = _index(start, stride), _index(end, stride)
+    if cells[start] or cells[end]:
+        return None
+    parent = array('i', [-1]) * len(cells)
+    parent[start] = start
+    cells[start] = 1  # 已访问的格子也标成墙
+    frontier = [start]
+    while frontier and parent[end] < 0:
+        next_frontier = []
+        for i in frontier:
+            for j in (i - stride, i + stride, i - 1, i + 1):
+                if not cells[j]:
+                    cells[j] = 1
+                    parent[j] = i
+                    next_frontier.append(j)
+        frontier = next_frontier
+    return _trace(parent, end, stride) if parent[end] >= 0 else None
+
+
+def bidirectional_bfs(maze, start, end):
+    """双向 BFS：每次扩展较小的一侧的一整层，两侧相遇时取经过相遇点的最短路径"""
+    cells, stride = _padded(maze)
+    start, end = _index(start, stride), _index(end, stride)
+    if cells[start] or cells[end]:
+        return None
+    if start == end:
+        return [_position(start, stride)]
+    # 两侧各自的 parent 和到各自起点的距离
+    parents = [array('i', [-1]) * len(cells), array('i', [-1]) * len(cells)]
+    distances = [array('i', [-1]) * len(cells), array('i', [-1]) * len(cells)]
+    frontiers = [[start], [end]]
+    for side, origin in enumerate((start, end)):
+        parents[side][origin] = origin
+        distances[side][origin] = 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, distance = parents[side], distances[side]
+        other = distances[1 - side]
+        best, meeting = None, None
+        next_frontier = []
+        for i in frontiers[side]:
+            for j in (i - stride, i + stride, i - 1, i + 1):
+                if cells[j] or distance[j] >= 0:
+                    continue
+                parent[j] = i
+                distance[j] = distance[i] + 1
+                next_frontier.append(j)
+                if other[j] >= 0 and (best is None or distance[j] + other[j] < best):
+                    best, meeting = distance[j] + other[j], j
+        frontiers[side] = next_frontier
+        if meeting is not None:
+            head = _trace(parents[0], meeting, stride)
+            tail = _trace(parents[1], meeting, stride)
+            return head + tail[-2::-1]
+    return None
+
+
+def astar(maze, start, end):
+    """A* 求最短路径，启发函数为曼哈顿距离"""
+    cells, stride = _padded(maze)
+    start, end = _index(start, stride), _index(end, stride)
+    if cells[start] or cells[end]:
+        return None
+    end_x, end_y = end % stride, end // stride
+    cost = array('i', [-1]) * len(cells)
+    parent = array('i', [-1]) * len(cells)
+    cost[start] = 0
+    parent[start] = start
+    # 堆中为 (估计总长, 到终点的估计, 下标)，估计总长相同时优先扩展离终点近的格子
+    heap = [(abs(start % stride - end_x) + abs(start // stride - end_y), 0, start)]
+    while heap:
+        _, _, i = heapq.heappop(heap)
+        if i == end:
+            return _trace(parent, end, stride)
+        step = cost[i] + 1
+        for j in (i - stride, i + stride, i - 1, i + 1):
+            if not cells[j] and (cost[j] < 0 or step < cost[j]):
+                cost[j] = step
+                parent[j] = i
+                remaining = abs(j % stride - end_x) + abs(j // stride - end_y)
+                heapq.heappush(heap, (step + remaining, remaining, j))
+    return None
+
+
+def distance_field(maze, target):
+    """
+    从 target 出发逐层 BFS，得到每个通路格到 target 的最短步数（int32 数组，形状与迷宫相同），
+    墙和到不了 target 的格子为 -1。每个迷宫只需计算一次，2001x2001 单元格的迷宫也只需几秒（见 bench_solver.py）。
+    BFS 本身没有向量化：迷宫的走廊又长又窄，每层只有几个格子而层数极多，按层用 NumPy 掩码扩展反而慢好几倍。
+    """
+    cells, stride = _padded(maze)
+    target = _index(target, stride)
+    distance = array('i', [unreachable]) * len(cells)
+    if not cells[target]:
+        distance[target] = 0
+        cells[target] = 1
+        frontier = [target]
+        step = 0
+        while frontier:
+            step += 1
+            next_frontier = []
+            append = next_frontier.append
+            for i in frontier:
+                for j in (i - stride, i + stride, i - 1, i + 1):
+                    if not cells[j]:
+                        cells[j] = 1
+                        distance[j] = step
+                        append(j)
+            frontier = next_frontier
+    return np.frombuffer(distance, dtype=np.int32).reshape(-1, stride)[1:-1, 1:-1]
+
+
+def direction_field(distances):
+    """
+    由距离场一次性（向量化）算出每个格子朝 target 走一步的方向编号（见 directions），
+    已在 target 上、墙和到不了 target 的格子为 -1
+    """
+    padded = np.pad(distances, 1, constant_values=unreachable)
+    rows, cols = distances.shape
+    result = np.full(distances.shape, -1, dtype=np.int8)
+    # 倒序写入，多个方向都能走时保留编号最小的方向
+    for code in reversed(range(len(directions))):
+        dx, dy = directions[code]
+        neighbor = padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+        result[(distances > 0) & (neighbor == distances - 1)] = code
+    return result
+
+
+def hint(steps, position):
+    """O(1) 提示：从 position 朝 target 走一步后的位置；已在 target 上或到不了 target 时返回 None"""
+    code = steps[position[1], position[0]]
+    if code < 0:
+        return None
+    dx, dy = directions[code]
+    return position[0] + dx, position[1] + dy
+
+
+def follow(distances, steps, start):
+    """
+    沿方向场从 start 走到 target，返回 (x, y) 路径（start 就是 target 时只有 start 一格）；
+    start 到不了 target 时返回 None。方向场在 target 和到不了的格子上都是 -1，所以还要用距离场区分
+    """
+    if distances[start[1], start[0]] == unreachable:
+        return None
+    path = [start]
+    while True:
+        position = hint(steps, path[-1])
+        if position is None:
+            break
+        path.append(position)
+    return path
+
+
+def score_run(step_count, optimal_steps, hints=0, hint_penalty=5, full_score=100):
+    """
+    按最短步数计算一关的得分：走出最短路径得满分，多走的步数按比例扣分，每次提示再扣 hint_penalty 分
+    """
+    if step_count <= 0 or optimal_steps < 0:
+        return 0
+    return max(0, round(full_score * optimal_steps / max(step_count, optimal_steps)) - hints * hint_penalty)
@@ -0,0 +1,105 @@
+import numpy as np
+import pygame
+
+# 迷宫游戏的绘制：墙壁不会变化，整张迷宫只在开始时画一次，缓存为每格 1 像素的 Surface，
+# 入口和出口也画在里面。窗口只显示跟随玩家滚动的视口，视口移动时才把对应区域放大成背景，
+# 视口不动时每帧只擦掉并重画玩家和提示所在的格子，返回需要更新到屏幕的矩形。
+
+wall_color = (0, 0, 0)
+path_color = (255, 255, 255)
+entrance_color = (0, 255, 0)
+exit_color = (255, 0, 0)
+player_color = (0, 0, 255)
+hint_color = (255, 215, 0)
+# 视口的最大像素尺寸，迷宫更大时滚动显示
+max_view_size = (1000, 700)
+
+
+class MazeView:
+    def __init__(self, maze, entrance, exit, cell_size=20, max_size=max_view_size, top=0):
+        """
+        maze 为迷宫数组（1 为墙、0 为通路），cell_size 为每格的边长（像素），
+        top 为视口上方留给得分等信息的高度（像素）
+        """
+        grid = np.asarray(maze, dtype=np.uint8)
+        self.rows, self.cols = grid.shape
+        self.cell_size = cell_size
+        self.top = top
+        self.view_cols = max(1, min(self.cols, max_size[0] // cell_size))
+        self.view_rows = max(1, min(self.rows, max_size[1] // cell_size))
+        self.size = (self.view_cols * cell_size, self.view_rows * cell_size)
+        # 玩家离视口边缘少于 margin 格时滚动视口
+        self.margin = (self.view_cols // 4, self.view_rows // 4)
+
+        # surfarray 的下标是 [x, y]，所以按转置后的迷宫查颜色表
+        palette = np.array([path_color, wall_color], dtype=np.uint8)
+        colors = palette[grid.T]
+        colors[entrance] = entrance_color
+        colors[exit] = exit_color
+        self.cells = pygame.surfarray.make_surface(colors)
+
+        self.camera = None  # 视口左上角所在的格子 (x, y)
+        self.background = None  # 当前视口放大后的迷宫
+        self.marks = []  # 上一帧画了玩家或提示的屏幕矩形
+        self.state = None  # 上一帧的 (视口, 玩家, 提示)
+
+    @property
+    def window_size(self):
+        return self.size[0], self.size[1] + self.top
+
+    def follow(self, position):
+        """必要时移动视口，使 position 离视口边缘至少 margin 格；返回视口是否移动"""
+        x, y = position
+        camera_x, camera_y = self.camera or (0, 0)
+        camera_x = min(max(camera_x, x - self.view_cols + 1 + self.margin[0]), x - self.margin[0])
+        camera_y = min(max(camera_y, y - self.view_rows + 1 + self.margin[1]), y - self.margin[1])
+        camera = (max(0, min(camera_x, self.cols - self.view_cols)),
+                  max(0, min(camera_y, self.rows - self.view_rows)))
+        if camera == self.camera:
+            return False
+        self.camera = camera
+        region = self.cells.subsurface((*camera, self.view_cols, self.view_rows))
+        self.background = pygame.transform.scale(region, self.size)
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        return True
+
+    def invalidate(self):
+        """下一次 draw 时重画整个视口，例如窗口被遮挡后"""
+        self.camera = None
+        self.state = None
+
+    def cell_rect(self, position):
+        """格子 position 在屏幕上的矩形；不在视口内时返回 None"""
+        x = position[0] - self.camera[0]
+        y = position[1] - self.camera[1]
+        if not (0 <= x < self.view_cols and 0 <= y < self.view_rows):
+            return None
+        return pygame.Rect(x * self.cell_size, y * self.cell_size + self.top, self.cell_size, self.cell_size)
+
+    def draw(self, screen, player_pos, hint_pos=None):
+        """画一帧，返回需要传给 pygame.display.update 的矩形列表；画面没有变化时返回空列表"""
+        moved = self.follow(player_pos)
+        state = (self.camera, tuple(player_pos), hint_pos)
+        if state == self.state:
+            return []
+        self.state = state
+
+        if moved:
+            screen.blit(self.background, (0, self.top))
+            dirty = [pygame.Rect(0, self.top, *self.size)]
+        else:
+            # 用背景盖住上一帧的玩家和提示
+            for rect in self.marks:
+                screen.blit(self.background, rect, rect.move(0, -self.top))
+            dirty = list(self.marks)
+
+        self.marks = []
+        for position, color in ((hint_pos, hint_color), (player_pos, player_color)):
+            rect = self.cell_rect(position) if position is not None else None
+            if rect is not None:
+                pygame.draw.rect(screen, color, rect)
+                self.marks.append(rect)
+        if not moved:
+            dirty.extend(self.marks)
+        return dirty
@@ -1,128 +1,27 @@
 import random
+
 import pygame
-from collections import deque
-
-
-class MazeGenerator:
-    def __init__(self, width, height, difficulty='medium'):
-        self.width = width
-        self.height = height
-        # 调整迷宫数组维度为 (2h+1) x (2w+1)
-        self.maze = [[1] * (2 * width + 1) for _ in range(2 * height + 1)]
-        self.visited = [[False] * width for _ in range(height)]
-        self.difficulty = difficulty
-        self.entrance = None
-        self.exit = None
-
-    def set_difficulty(self):
-        difficulty_settings = {
-            'easy': 0.2,
-            'medium': 0.5,
-            'hard': 0.8
-        }
-        self.wall_probability = difficulty_settings.get(self.difficulty, 0.5)
-
-    def generate_maze(self):
-        self.set_difficulty()
-        # 初始化随机起点
-        start_x = random.randint(0, self.width - 1)
-        start_y = random.randint(0, self.height - 1)
-
-        # 使用DFS生成迷宫基础结构
-        stack = [(start_x, start_y)]
-        self.visited[start_y][start_x] = True
-        self.maze[2 * start_y + 1][2 * start_x + 1] = 0
-
-        while stack:
-            x, y = stack[-1]
-            neighbors = self._get_unvisited_neighbors(x, y)
-
-            if neighbors:
-                nx, ny = random.choice(neighbors)
-                # 打通当前单元格与邻居之间的墙
-                self.maze[2 * y + 1 + (ny - y)][2 * x + 1 + (nx - x)] = 0
-                self.maze[2 * ny + 1][2 * nx + 1] = 0
-                self.visited[ny][nx] = True
-                stack.append((nx, ny))
-            else:
-                stack.pop()
-
-        # 设置入口和出口（关键修改）
-        mid_y = 2 * self.height // 2  # 垂直方向中间位置（因为数组长度是2h+1）
-        self.entrance = (0, mid_y)  # 左边界中间
-        self.exit = (2 * self.width, mid_y)  # 右边界中间
-
-        # 确保入口出口是通路
-        self.maze[mid_y][0] = 0
-        self.maze[mid_y][2 * self.width] = 0
-
-        # 根据难度添加随机墙壁
-        self._add_random_walls()
-
-        return self.maze
-
-    def _get_unvisited_neighbors(self, x, y):
-        """获取未访问的相邻单元格"""
-        neighbors = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.width and 0 <= ny < self.height:
-                if not self.visited[ny][nx]:
-                    neighbors.append((nx, ny))
-        return neighbors
-
-    def _add_random_walls(self):
-        """根据难度添加额外墙壁"""
-        for y in range(1, 2 * self.height, 2):
-            for x in range(1, 2 * self.width, 2):
-                if random.random() < self.wall_probability:
-                    candidates = []
-                    # 检查上下左右可能的墙壁位置
-                    if y > 1 and self.maze[y - 1][x] == 0:
-                        candidates.append((y - 1, x))
-                    if y < 2 * self.height - 1 and self.maze[y + 1][x] == 0:
-                        candidates.append((y + 1, x))
-                    if x > 1 and self.maze[y][x - 1] == 0:
-                        candidates.append((y, x - 1))
-                    if x < 2 * self.width - 1 and self.maze[y][x + 1] == 0:
-                        candidates.append((y, x + 1))
-
-                    for candidate in candidates:
-                        wy, wx = candidate
-                        # 临时添加墙壁
-                        temp_maze = [row[:] for row in self.maze]
-                        temp_maze[wy][wx] = 1
-                        # 检查添加墙壁后是否仍然连通
-                        if self._is_connected(temp_maze, self.entrance, self.exit):
-                            self.maze[wy][wx] = 1
-
-    def _is_connected(self, maze, start, end):
-        """检查从起点到终点是否连通"""
-        queue = deque([start])
-        visited = set()
-        visited.add(start)
-
-        while queue:
-            x, y = queue.popleft()
-            if (x, y) == end:
-                return True
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in visited:
-                    queue.append((nx, ny))
-                    visited.add((nx, ny))
-        return False
+
+from maze_cache import LevelPrefetcher, level_seed
+from maze_solver import direction_field, distance_field, hint, score_run
+from maze_view import MazeView
 
 
 def play_maze(maze, entrance, exit, level, score):
     pygame.init()
     CELL_SIZE = 20
-    WINDOW_SIZE = (len(maze[0]) * CELL_SIZE, len(maze) * CELL_SIZE + 50)  # 增加 50 像素用于显示得分和关卡信息
+    font = pygame.font.Font(None, 36)
+    # 迷宫上方显示得分和关卡信息的区域，高度按字体的行高放下两行文字
+    HUD_MARGIN = 10
+    HUD_HEIGHT = 2 * HUD_MARGIN + 2 * font.get_linesize()
+    # 迷宫画面只生成一次，窗口过小时跟随玩家滚动
+    view = MazeView(maze, entrance, exit, CELL_SIZE, top=HUD_HEIGHT)
 
-    screen = pygame.display.set_mode(WINDOW_SIZE)
+    screen = pygame.display.set_mode(view.window_size)
     pygame.display.set_caption("Maze Game")
+    screen.fill((255, 255, 255))
+    hud_rect = pygame.Rect(0, 0, view.window_size[0], HUD_HEIGHT)
+    hud = None  # 上一帧显示的得分信息，变化时才重画
 
     # 初始化玩家位置（入口坐标转换）
     player_pos = [entrance[0], entrance[1]]
@@ -132,12 +31,23 @@ def play_maze(maze, entrance, exit, level, score):
     game_won = False
     step_count = 0  # 记录移动步数
 
-    font = pygame.font.Font(None, 36)
+    # 出口的距离场和方向场每关只算一次，之后的提示和计分都是 O(1) 查表
+    distances = distance_field(maze, exit)
+    steps = direction_field(distances)
+    optimal_steps = int(distances[entrance[1]][entrance[0]])  # 入口到出口的最短步数
+    hint_count = 0  # 按 H 键请求提示的次数
+    show_hint = False
 
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                view.invalidate()
+                hud = None
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_h and not show_hint:
+                show_hint = True
+                hint_count += 1
 
         # 处理键盘输入
         keys = pygame.key.get_pressed()
@@ -156,40 +66,34 @@ def play_maze(maze, entrance, exit, level, score):
             if maze[new_pos[1]][new_pos[0]] == 0:
                 player_pos = new_pos
                 step_count += 1  # 移动步数加 1
+                show_hint = False
 
         # 检查胜利条件
         if (player_pos[0], player_pos[1]) == exit:
             game_won = True
             running = False
-            score += 100 - step_count  # 根据移动步数计算得分
-
-        # 绘制界面
-        screen.fill((255, 255, 255))
+            score += score_run(step_count, optimal_steps, hint_count)  # 按实际步数与最短步数之比计算得分
 
-        # 绘制迷宫
-        for y in range(len(maze)):
-            for x in range(len(maze[0])):
-                if maze[y][x] == 1:
-                    pygame.draw.rect(screen, (0, 0, 0),
-                                     (x * CELL_SIZE, y * CELL_SIZE + 50, CELL_SIZE, CELL_SIZE))
-
-        # 绘制入口（绿色）和出口（红色）
-        pygame.draw.rect(screen, (0, 255, 0),
-                         (entrance[0] * CELL_SIZE, entrance[1] * CELL_SIZE + 50, CELL_SIZE, CELL_SIZE))
-        pygame.draw.rect(screen, (255, 0, 0),
-                         (exit[0] * CELL_SIZE, exit[1] * CELL_SIZE + 50, CELL_SIZE, CELL_SIZE))
-
-        # 绘制玩家（蓝色）
-        pygame.draw.rect(screen, (0, 0, 255),
-                         (player_pos[0] * CELL_SIZE, player_pos[1] * CELL_SIZE + 50, CELL_SIZE, CELL_SIZE))
+        # 只重画有变化的部分：视口移动时整个视口，否则只有玩家和提示移动前后的格子
+        next_pos = hint(steps, player_pos) if show_hint else None
+        dirty = view.draw(screen, player_pos, next_pos)
 
         # 显示得分和关卡信息
-        score_text = font.render(f"Score: {score}", True, (0, 0, 0))
-        level_text = font.render(f"Level: {level}", True, (0, 0, 0))
-        screen.blit(score_text, (10, 10))
-        screen.blit(level_text, (10, 40))
-
-        pygame.display.flip()
+        if hud != (score, level, step_count):
+            hud = (score, level, step_count)
+            screen.fill((255, 255, 255), hud_rect)
+            score_text = font.render(f"Score: {score}", True, (0, 0, 0))
+            level_text = font.render(f"Level: {level}", True, (0, 0, 0))
+            steps_text = font.render(f"Steps: {step_count} / {optimal_steps}", True, (0, 0, 0))
+            # 文字只画在信息区域内，不会盖住下方的迷宫视口
+            screen.set_clip(hud_rect)
+            dirty.append(hud_rect)
+            dirty.append(screen.blit(score_text, (HUD_MARGIN, HUD_MARGIN)))
+            dirty.append(screen.blit(level_text, (HUD_MARGIN, HUD_MARGIN + font.get_linesize())))
+            dirty.append(screen.blit(steps_text, (200, HUD_MARGIN)))
+            screen.set_clip(None)
+
+        pygame.display.update(dirty)
         clock.tick(30)
 
     pygame.quit()
@@ -203,22 +107,30 @@ if __name__ == "__main__":
         (20, 20, 'hard')
     ]
 
+    ALGORITHM = 'dfs'
+    SEED = None  # 指定整数时每次游戏的迷宫相同，可以直接从缓存读取
+    game_seed = SEED if SEED is not None else random.randrange(1000000)
+    print(f"Seed: {game_seed}")
+
+    # 后面的关卡在后台进程中提前生成并缓存，切换关卡时不需要等待生成
+    specs = [(width, height, difficulty, ALGORITHM, level_seed(game_seed, level))
+             for level, (width, height, difficulty) in enumerate(levels, start=1)]
     score = 0
-    for level, (width, height, difficulty) in enumerate(levels, start=1):
-        generator = MazeGenerator(width, height, difficulty)
-        maze = generator.generate_maze()
-
-        # 验证入口出口坐标有效性
-        print(f"Entrance: {generator.entrance}")
-        print(f"Exit: {generator.exit}")
-
-        game_won: bool
-        game_won, score = play_maze(maze, generator.entrance, generator.exit, level, score)
-        if not game_won:
-            print("Game Over!")
-            break
-        else:
-            print(f"Level {level} completed! Your score: {score}")
+    with LevelPrefetcher(specs) as prefetcher:
+        for level in range(1, len(levels) + 1):
+            maze, entrance, exit = prefetcher.get()
+
+            # 验证入口出口坐标有效性
+            print(f"Entrance: {entrance}")
+            print(f"Exit: {exit}")
+
+            game_won: bool
+            game_won, score = play_maze(maze, entrance, exit, level, score)
+            if not game_won:
+                print("Game Over!")
+                break
+            else:
+                print(f"Level {level} completed! Your score: {score}")
 
     if game_won:
         print("Congratulations! You've completed all levels!")
@@ -1,5 +1,16 @@
+import argparse
+
 import matplotlib.pyplot as plt
 import numpy as np
+from score_loader import load_scores
+from score_stats import ScoreStats, stream_files
+
+# Plot one bar per student up to this many students
+bar_limit = 50
+# Plot a top-N/bottom-N ranking up to this many students, a histogram above it
+ranking_limit = 5000
+# Number of histogram bins over 0 - 100
+histogram_bins = 50
 
 def get_valid_integer_input(prompt):
     """
@@ -50,16 +61,20 @@ def get_student_scores():
                 print("The score must be between 0 and 100. Please re-enter.")
     return students, scores
 
-def display_scores(students, scores):
+def display_scores(students, scores, max_rows=None):
     """
     Display the list of student names and their corresponding scores.
 
     :param students: A list of student names
     :param scores: A list of student scores
+    :param max_rows: The maximum number of students to print. If None, all students are printed.
     """
     print("Student Score List:")
-    for student, score in zip(students, scores):
+    shown = len(students) if max_rows is None else min(max_rows, len(students))
+    for student, score in zip(students[:shown], scores[:shown]):
         print(f"{student}: {score}")
+    if shown < len(students):
+        print(f"... and {len(students) - shown} more students")
 
 def calculate_average(scores):
     """
@@ -70,50 +85,215 @@ def calculate_average(scores):
     """
     return np.mean(scores)
 
-def plot_scores(students, scores, save_path=None):
+def choose_plot_mode(count, groups=None):
+    """
+    Choose how to plot the scores from the number of students.
+
+    :param count: The number of students
+    :param groups: The group of each student, or None
+    :return: 'bars' for small sets, otherwise 'box' when groups are given, 'ranking' for medium sets and
+             'histogram' for large sets
+    """
+    if count <= bar_limit:
+        return 'bars'
+    if groups is not None:
+        return 'box'
+    if count <= ranking_limit:
+        return 'ranking'
+    return 'histogram'
+
+def plot_bars(ax, students, scores):
     """
-    Plot a bar chart of student scores and optionally save the chart as an image.
+    Plot one labelled bar per student.
+
+    :param ax: The axes to draw on
+    :param students: A list of student names
+    :param scores: A list of student scores
+    """
+    bars = ax.bar(students, scores, color='skyblue', edgecolor='black')
+    ax.bar_label(bars, fmt='%g', padding=3, fontsize=10)
+    ax.set_title("Student Score Bar Chart", fontsize=16)
+    ax.set_xlabel("Student Names", fontsize=12)
+    ax.set_ylabel("Scores", fontsize=12)
+    ax.set_ylim(0, 110)
+    ax.tick_params(labelsize=10)
+    ax.tick_params(axis='x', labelrotation=45 if len(students) > 10 else 0)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def plot_ranking(ax, students, scores, top_n):
+    """
+    Plot the top-N and bottom-N students as horizontal bars, best at the top.
+    With fewer than 2 students there is no ranking to show, so a plain bar chart is drawn instead.
+
+    :param ax: The axes to draw on
+    :param students: A list of student names
+    :param scores: A NumPy array of student scores
+    :param top_n: The number of students shown at each end of the ranking
+    """
+    if len(scores) < 2:
+        plot_bars(ax, students, scores)
+        return
+    top_n = max(1, min(top_n, len(scores) // 2))
+    top = np.argpartition(scores, -top_n)[-top_n:]
+    bottom = np.argpartition(scores, top_n)[:top_n]
+    top = top[np.argsort(scores[top])]
+    bottom = bottom[np.argsort(scores[bottom])]
+    order = np.concatenate([bottom, top])
+    positions = np.concatenate([np.arange(top_n), np.arange(top_n) + top_n + 1])
+    colors = ['salmon'] * top_n + ['skyblue'] * top_n
+    bars = ax.barh(positions, scores[order], color=colors, edgecolor='black')
+    ax.bar_label(bars, fmt='%g', padding=3, fontsize=8)
+    ax.set_yticks(positions, [students[i] for i in order], fontsize=8)
+    ax.set_title(f"Top {top_n} and Bottom {top_n} of {len(scores)} Students", fontsize=16)
+    ax.set_xlabel("Scores", fontsize=12)
+    ax.set_xlim(0, 110)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+
+def plot_histogram(ax, scores):
+    """
+    Plot the score distribution as a histogram computed in NumPy, with the mean and quartiles marked.
+
+    :param ax: The axes to draw on
+    :param scores: A NumPy array of student scores
+    """
+    stats = ScoreStats.from_scores(scores)
+    counts, edges = stats.histogram(histogram_bins)
+    ax.stairs(counts, edges, fill=True, color='skyblue', edgecolor='black')
+    quartiles = stats.percentile([25, 50, 75])
+    ax.axvline(stats.mean, color='red', linewidth=1.5, label=f"Mean {stats.mean:.1f}")
+    ax.vlines(quartiles, 0, counts.max(), colors='dimgray', linestyles='--',
+              label="Quartiles " + " / ".join(f"{q:.1f}" for q in quartiles))
+    ax.set_title(f"Score Distribution of {len(scores)} Students", fontsize=16)
+    ax.set_xlabel("Scores", fontsize=12)
+    ax.set_ylabel("Students", fontsize=12)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def plot_box(ax, scores, groups):
+    """
+    Plot one box per group.
+
+    :param ax: The axes to draw on
+    :param scores: A NumPy array of student scores
+    :param groups: A NumPy array with the group of each student
+    """
+    keys, inverse = np.unique(groups, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(keys)))[:-1]
+    ax.boxplot(np.split(scores[order], splits), showfliers=False)
+    ax.set_xticks(np.arange(1, len(keys) + 1), keys)
+    ax.set_title(f"Scores of {len(scores)} Students by Group", fontsize=16)
+    ax.set_ylabel("Scores", fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45 if len(keys) > 10 else 0)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def plot_scores(students, scores, save_path=None, mode='auto', groups=None, top_n=20, show=True):
+    """
+    Plot the student scores and optionally save the chart as an image.
+    Small sets are drawn as one bar per student; larger sets are drawn as a ranking, a histogram
+    or a box plot per group so that the chart stays fast and readable.
 
     :param students: A list of student names
     :param scores: A list of student scores
     :param save_path: The path to save the image. If None, the image will not be saved.
+    :param mode: 'auto', 'bars', 'ranking', 'histogram' or 'box'
+    :param groups: The group of each student, needed for the box plot
+    :param top_n: The number of students shown at each end of the ranking
+    :param show: Whether to show the chart in a window. If False, the chart is only saved.
     """
     try:
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(students, scores, color='skyblue', edgecolor='black')
-        plt.title("Student Score Bar Chart", fontsize=16)
-        plt.xlabel("Student Names", fontsize=12)  # Added x-axis label
-        plt.ylabel("Scores", fontsize=12)  # Added y-axis label
-        plt.xticks(fontsize=10)
-        plt.yticks(fontsize=10)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width() / 2, height + 1, str(height), ha='center', va='bottom', fontsize=10)
+        scores = np.asarray(scores, dtype=np.float64)
+        if mode == 'auto':
+            mode = choose_plot_mode(len(scores), groups)
+        fig, ax = plt.subplots(figsize=(10, 6) if mode != 'ranking' else (10, max(6, top_n * 0.5)))
+        if mode == 'bars':
+            plot_bars(ax, students, scores)
+        elif mode == 'ranking':
+            plot_ranking(ax, students, scores, top_n)
+        elif mode == 'histogram':
+            plot_histogram(ax, scores)
+        elif mode == 'box':
+            if groups is None:
+                raise ValueError("The box plot needs the group of each student")
+            plot_box(ax, scores, np.asarray(groups))
+        else:
+            raise ValueError(f"Unknown plot mode {mode}")
+        fig.tight_layout()
 
         if save_path:
-            plt.savefig(save_path)
-            print(f"The bar chart has been saved as {save_path}")
+            fig.savefig(save_path)
+            print(f"The chart has been saved as {save_path}")
 
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
     except Exception as e:
-        print(f"An error occurred while plotting the bar chart: {e}")
+        print(f"An error occurred while plotting the chart: {e}")
+
+def parse_args():
+    """
+    Parse the command line options. Without --input the program asks for the scores interactively.
+
+    :return: The parsed options
+    """
+    parser = argparse.ArgumentParser(description="Student score analysis and visualization")
+    parser.add_argument('--input', help="CSV file with name and score columns, or '-' to read from stdin")
+    parser.add_argument('--errors', default='score_errors.csv', help="CSV report of rejected rows in batch mode")
+    parser.add_argument('--chunksize', type=int, default=100000, help="Rows read at a time in batch mode")
+    parser.add_argument('--name-column', default='name', help="Column holding student names")
+    parser.add_argument('--score-column', default='score', help="Column holding scores")
+    parser.add_argument('--save', default=None, help="File name to save the chart in batch mode")
+    parser.add_argument('--plot-mode', default='auto', choices=['auto', 'bars', 'ranking', 'histogram', 'box'],
+                        help="Chart type; auto chooses from the number of students")
+    parser.add_argument('--top-n', type=int, default=20, help="Students shown at each end of the ranking chart")
+    parser.add_argument('--no-show', action='store_true', help="Only save the chart, do not open a window")
+    parser.add_argument('--max-rows', type=int, default=20, help="Students printed in batch mode")
+    parser.add_argument('--report', nargs='+', metavar='PATH',
+                        help="Print streaming statistics of one or more CSV files without loading them into memory")
+    parser.add_argument('--group-by', default=None,
+                        help="Column to group the statistics and the box plot by, e.g. class or subject")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --report with several files")
+    return parser.parse_args()
+
+def load_batch(args):
+    """
+    Load names and scores in batch mode and report the rejected rows.
+
+    :param args: The parsed command line options
+    :return: A list of student names, a NumPy array of their scores and their groups (None without --group-by)
+    """
+    students, scores, rejected, groups = load_scores(args.input, args.errors, args.chunksize,
+                                                     args.name_column, args.score_column, args.group_by)
+    print(f"Loaded {len(students)} students from {args.input}")
+    if rejected:
+        print(f"{rejected} rows were rejected, see {args.errors}")
+    return students, scores, groups
 
 def main():
     """
     The main function, the entry point of the program, responsible for calling other functions to complete student score analysis and visualization.
     """
-    students, scores = get_student_scores()
-    if students and scores:
-        display_scores(students, scores)
+    args = parse_args()
+    if args.report:
+        stats = stream_files(args.report, args.group_by, args.workers, args.chunksize,
+                             args.name_column, args.score_column)
+        print(stats.report())
+        return
+    groups = None
+    if args.input:
+        students, scores, groups = load_batch(args)
+    else:
+        students, scores = get_student_scores()
+    if len(students) and len(scores):
+        display_scores(students, scores, args.max_rows if args.input else None)
         average_score = calculate_average(scores)
         print(f"\nAverage Score of Students: {average_score:.2f}")
-        save_path = input("Please enter the file name to save the bar chart (leave blank to not save): ")
-        if save_path:
-            plot_scores(students, scores, save_path)
+        if args.input:
+            save_path = args.save
         else:
-            plot_scores(students, scores)
+            save_path = input("Please enter the file name to save the bar chart (leave blank to not save): ")
+        plot_scores(students, scores, save_path or None, args.plot_mode, groups, args.top_n, not args.no_show)
     else:
         print("No valid score data was obtained. The program ends.")
 
@@ -0,0 +1,118 @@
+import csv
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Valid score range, inclusive
+min_score = 0
+max_score = 100
+# Columns of the error report written for rejected rows
+error_columns = ['line', 'name', 'score', 'reason']
+
+def open_source(source):
+    """
+    Open a CSV source for reading.
+
+    :param source: A file path, or '-' to read from standard input
+    :return: A path or file object accepted by pandas.read_csv
+    """
+    return sys.stdin if source == '-' else source
+
+def validate_chunk(chunk, name_column='name', score_column='score', first_line=2):
+    """
+    Validate one chunk of raw rows with vectorized NumPy masks.
+    A row is rejected when the name is empty, the score is not a number, or the score is outside 0 - 100.
+
+    :param chunk: A DataFrame chunk with the name and score columns as strings
+    :param name_column: The column holding student names
+    :param score_column: The column holding scores
+    :param first_line: The line number of the first row of the chunk in the source file
+    :return: A DataFrame of accepted rows (score converted to float) and a DataFrame of rejected rows
+    """
+    names = chunk[name_column].fillna('').str.strip()
+    raw_scores = chunk[score_column].fillna('').str.strip()
+    scores = pd.to_numeric(raw_scores, errors='coerce').to_numpy(dtype=np.float64)
+
+    missing_name = (names == '').to_numpy()
+    not_number = np.isnan(scores)
+    out_of_range = ~not_number & ((scores < min_score) | (scores > max_score))
+    rejected = missing_name | not_number | out_of_range
+
+    accepted = chunk.loc[~rejected].assign(**{name_column: names[~rejected], score_column: scores[~rejected]})
+    reasons = np.select([missing_name, not_number, out_of_range],
+                        ['missing name', 'score is not a number', f'score is outside {min_score} - {max_score}'], '')
+    errors = pd.DataFrame({
+        'line': np.arange(first_line, first_line + len(chunk))[rejected],
+        'name': names.to_numpy()[rejected],
+        'score': raw_scores.to_numpy()[rejected],
+        'reason': reasons[rejected],
+    })
+    return accepted, errors
+
+def iter_score_chunks(source, chunksize=100000, name_column='name', score_column='score', errors=None):
+    """
+    Read names and scores from a CSV file or stdin in chunks and yield the valid rows of each chunk
+    together with the number of rows rejected from it.
+    Rejected rows are written to the error report instead of stopping the program.
+
+    :param source: A CSV file path with a header row, or '-' for standard input
+    :param chunksize: The number of rows read at a time
+    :param name_column: The column holding student names
+    :param score_column: The column holding scores
+    :param errors: An open csv.writer for the error report, or None to discard rejected rows
+    :return: A generator of (DataFrame of validated rows, number of rejected rows)
+    """
+    first_line = 2  # line 1 is the header
+    reader = pd.read_csv(open_source(source), chunksize=chunksize, dtype=str, keep_default_na=False,
+                         skipinitialspace=True)
+    for chunk in reader:
+        missing = [column for column in (name_column, score_column) if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing column(s) {', '.join(missing)} in {source}; found {', '.join(chunk.columns)}")
+        accepted, rejected = validate_chunk(chunk, name_column, score_column, first_line)
+        if errors is not None and len(rejected):
+            errors.writerows(rejected.itertuples(index=False, name=None))
+        first_line += len(chunk)
+        yield accepted, len(rejected)
+
+def load_scores(source, error_report=None, chunksize=100000, name_column='name', score_column='score',
+                group_column=None):
+    """
+    Load all valid names and scores from a CSV file or stdin.
+
+    :param source: A CSV file path with a header row, or '-' for standard input
+    :param error_report: The path of the CSV error report for rejected rows, or None to skip the report
+    :param chunksize: The number of rows read at a time
+    :param name_column: The column holding student names
+    :param score_column: The column holding scores
+    :param group_column: The column holding the group of each student (e.g. class), or None
+    :return: A list of student names, a NumPy array of their scores, the number of rejected rows,
+             and a NumPy array of groups (None without group_column)
+    """
+    students = []
+    score_chunks = []
+    group_chunks = []
+    rejected = 0
+    report = open(error_report, 'w', newline='', encoding='utf-8') if error_report else None
+    try:
+        writer = None
+        if report is not None:
+            writer = csv.writer(report)
+            writer.writerow(error_columns)
+        for accepted, count in iter_score_chunks(source, chunksize, name_column, score_column, writer):
+            students.extend(accepted[name_column].tolist())
+            score_chunks.append(accepted[score_column].to_numpy(dtype=np.float64))
+            if group_column is not None:
+                if group_column not in accepted.columns:
+                    raise ValueError(f"Missing column {group_column} in {source}")
+                group_chunks.append(accepted[group_column].to_numpy(dtype=str))
+            rejected += count
+    finally:
+        if report is not None:
+            report.close()
+    scores = np.concatenate(score_chunks) if score_chunks else np.empty(0)
+    groups = None
+    if group_column is not None:
+        groups = np.concatenate(group_chunks) if group_chunks else np.empty(0, dtype=str)
+    return students, scores, rejected, groups
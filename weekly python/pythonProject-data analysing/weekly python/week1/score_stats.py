@@ -0,0 +1,250 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from score_loader import iter_score_chunks, max_score, min_score
+
+# Number of fixed histogram bins over the valid score range (0.1 points per bin)
+hist_bins = 1000
+bin_width = (max_score - min_score) / hist_bins
+# Percentiles printed in reports
+report_percentiles = [10, 25, 50, 75, 90]
+
+def bin_index(values):
+    """
+    Find the histogram bin of each score. The maximum score falls into the last bin.
+
+    :param values: A NumPy array of valid scores
+    :return: A NumPy array of bin indices
+    """
+    index = ((values - min_score) / bin_width).astype(np.intp)
+    return np.minimum(index, hist_bins - 1)
+
+class ScoreStats:
+    """
+    One-pass statistics of a stream of scores: count, mean, variance (Welford moments), min/max and a
+    fixed-bin histogram for percentiles. Two ScoreStats built from different chunks, files or processes
+    merge into the same result as a single pass over all the scores.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.min = np.inf
+        self.max = -np.inf
+        self.hist = np.zeros(hist_bins, dtype=np.int64)
+
+    @classmethod
+    def from_scores(cls, scores):
+        """
+        Build the statistics of an array of scores.
+
+        :param scores: A list or NumPy array of valid scores
+        :return: A new ScoreStats
+        """
+        stats = cls()
+        stats.update(scores)
+        return stats
+
+    def update(self, scores):
+        """
+        Add a chunk of scores.
+
+        :param scores: A list or NumPy array of valid scores
+        :return: self
+        """
+        values = np.asarray(scores, dtype=np.float64)
+        if not len(values):
+            return self
+        chunk = ScoreStats()
+        chunk.count = len(values)
+        chunk.mean = values.mean()
+        chunk.m2 = np.square(values - chunk.mean).sum()
+        chunk.min = values.min()
+        chunk.max = values.max()
+        chunk.hist = np.bincount(bin_index(values), minlength=hist_bins)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Merge the statistics of another stream into this one (Chan et al. parallel update).
+
+        :param other: Another ScoreStats
+        :return: self
+        """
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.hist += other.hist
+        return self
+
+    def variance(self, ddof=0):
+        """
+        :param ddof: Delta degrees of freedom, 0 for the population variance and 1 for the sample variance
+        :return: The variance of the scores, or NaN when there are not enough scores
+        """
+        return self.m2 / (self.count - ddof) if self.count > ddof else np.nan
+
+    def std(self, ddof=0):
+        """
+        :param ddof: Delta degrees of freedom, 0 for the population and 1 for the sample standard deviation
+        :return: The standard deviation of the scores
+        """
+        return np.sqrt(self.variance(ddof))
+
+    def percentile(self, q):
+        """
+        Approximate percentiles from the histogram, interpolating linearly inside a bin.
+        The error is at most one bin width (0.1 points).
+
+        :param q: A percentile or a list of percentiles between 0 and 100
+        :return: The approximate score at each percentile
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if not self.count:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(self.hist)
+        target = q / 100 * self.count
+        index = np.minimum(np.searchsorted(cumulative, target, side='left'), hist_bins - 1)
+        before = np.where(index > 0, cumulative[index - 1], 0)
+        inside = self.hist[index]
+        fraction = np.divide(target - before, inside, out=np.zeros(q.shape), where=inside > 0)
+        result = min_score + (index + fraction) * bin_width
+        return np.clip(result, self.min, self.max)
+
+    def histogram(self, bins=10):
+        """
+        Regroup the fixed bins into fewer, wider bins.
+
+        :param bins: The number of bins; must divide the number of fixed bins
+        :return: The bin counts and the bin edges
+        """
+        if hist_bins % bins:
+            raise ValueError(f"bins must divide {hist_bins}")
+        counts = self.hist.reshape(bins, -1).sum(axis=1)
+        edges = np.linspace(min_score, max_score, bins + 1)
+        return counts, edges
+
+    def summary(self):
+        """
+        :return: A one-line description of the statistics
+        """
+        if not self.count:
+            return "no scores"
+        quantiles = ", ".join(f"p{q}={v:.1f}" for q, v in zip(report_percentiles, self.percentile(report_percentiles)))
+        return (f"n={self.count}, mean={self.mean:.2f}, std={self.std():.2f}, "
+                f"min={self.min:.1f}, max={self.max:.1f}, {quantiles}")
+
+class GroupedStats:
+    """
+    Score statistics of the whole stream and of each group (for example each class or subject).
+    """
+
+    def __init__(self, group_by=None):
+        self.group_by = group_by
+        self.total = ScoreStats()
+        self.groups = {}
+        self.rejected = 0
+
+    def update(self, chunk, score_column='score'):
+        """
+        Add a chunk of validated rows. Per-group moments and histograms are computed with bincount,
+        so the cost does not grow with the number of groups.
+
+        :param chunk: A DataFrame of validated rows
+        :param score_column: The column holding scores
+        :return: self
+        """
+        values = chunk[score_column].to_numpy(dtype=np.float64)
+        self.total.update(values)
+        if self.group_by is None or not len(values):
+            return self
+        keys, inverse = np.unique(chunk[self.group_by].astype(str).to_numpy(), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        means = np.bincount(inverse, weights=values, minlength=len(keys)) / counts
+        m2 = np.bincount(inverse, weights=np.square(values - means[inverse]), minlength=len(keys))
+        order = np.argsort(inverse, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        mins = np.minimum.reduceat(values[order], starts)
+        maxs = np.maximum.reduceat(values[order], starts)
+        hists = np.bincount(inverse * hist_bins + bin_index(values),
+                            minlength=len(keys) * hist_bins).reshape(len(keys), hist_bins)
+        for i, key in enumerate(keys):
+            part = ScoreStats()
+            part.count, part.mean, part.m2 = int(counts[i]), means[i], m2[i]
+            part.min, part.max, part.hist = mins[i], maxs[i], hists[i]
+            self.groups.setdefault(key, ScoreStats()).merge(part)
+        return self
+
+    def merge(self, other):
+        """
+        Merge the statistics of another stream, for example another file.
+
+        :param other: Another GroupedStats with the same grouping
+        :return: self
+        """
+        self.total.merge(other.total)
+        for key, stats in other.groups.items():
+            self.groups.setdefault(key, ScoreStats()).merge(stats)
+        self.rejected += other.rejected
+        return self
+
+    def report(self):
+        """
+        :return: A printable report of the overall and per-group statistics
+        """
+        lines = [f"All students: {self.total.summary()}"]
+        if self.rejected:
+            lines.append(f"Rejected rows: {self.rejected}")
+        for key in sorted(self.groups):
+            lines.append(f"{self.group_by} {key}: {self.groups[key].summary()}")
+        return "\n".join(lines)
+
+def stream_file(source, group_by=None, chunksize=100000, name_column='name', score_column='score'):
+    """
+    Compute the statistics of one score file in a single pass without keeping its rows in memory.
+
+    :param source: A CSV file path with a header row, or '-' for standard input
+    :param group_by: The column to group by, or None for overall statistics only
+    :param chunksize: The number of rows read at a time
+    :param name_column: The column holding student names
+    :param score_column: The column holding scores
+    :return: A GroupedStats
+    """
+    stats = GroupedStats(group_by)
+    for accepted, rejected in iter_score_chunks(source, chunksize, name_column, score_column):
+        if group_by is not None and group_by not in accepted.columns:
+            raise ValueError(f"Missing column {group_by} in {source}")
+        stats.update(accepted, score_column)
+        stats.rejected += rejected
+    return stats
+
+def stream_files(sources, group_by=None, workers=None, chunksize=100000, name_column='name', score_column='score'):
+    """
+    Compute the statistics of several score files, one file per worker process, and merge them.
+
+    :param sources: A list of CSV file paths
+    :param group_by: The column to group by, or None for overall statistics only
+    :param workers: The number of worker processes; 1 computes the files one after another in this process
+    :param chunksize: The number of rows read at a time
+    :param name_column: The column holding student names
+    :param score_column: The column holding scores
+    :return: A GroupedStats of all files
+    """
+    options = (group_by, chunksize, name_column, score_column)
+    if workers == 1 or len(sources) == 1:
+        parts = [stream_file(source, *options) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(stream_file, sources, *[[option] * len(sources) for option in options]))
+    result = GroupedStats(group_by)
+    for part in parts:
+        result.merge(part)
+    return result
@@ -0,0 +1,64 @@
+import argparse
+import glob
+import os
+import time
+
+from douban_pages import load_movies, page_size, render_page
+from extractors import extractors
+
+# 提取后端的一致性校验与微基准：所有后端对同一页面必须输出完全相同的电影字典，
+# 之后分别测量每个后端每秒能提取多少个电影项
+
+
+def load_pages(pages_dir, csv_file):
+    """
+    读取 pages_dir 下保存的列表页 HTML；未指定目录时用 CSV 数据渲染页面，
+    此时同时返回期望的电影列表，用于校验提取结果。
+    """
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+            with open(path, encoding='utf-8') as f:
+                pages.append(f.read())
+        return pages, None
+    movies = load_movies(csv_file)
+    pages = [render_page(movies, start) for start in range(0, len(movies), page_size)]
+    return pages, movies
+
+
+def check_parity(pages, expected=None):
+    """逐页比较各后端的输出，有差异时抛出 AssertionError"""
+    reference_name = 'html.parser'
+    results = {name: [extract(html) for html in pages] for name, extract in extractors.items()}
+    reference = results[reference_name]
+    for name, pages_movies in results.items():
+        for index, (movies, reference_movies) in enumerate(zip(pages_movies, reference)):
+            assert movies == reference_movies, f'{name} 与 {reference_name} 在第 {index + 1} 页的结果不一致'
+    if expected is not None:
+        extracted = [movie for movies in reference for movie in movies]
+        assert extracted == expected, '提取结果与 CSV 原始数据不一致'
+    return sum(len(movies) for movies in reference)
+
+
+def bench(pages, repeat):
+    for name, extract in extractors.items():
+        begin = time.perf_counter()
+        items = 0
+        for _ in range(repeat):
+            for html in pages:
+                items += len(extract(html))
+        elapsed = time.perf_counter() - begin
+        print(f"{name:<12} {items / elapsed:10.0f} 项/秒 ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTML 提取后端一致性校验与基准测试')
+    parser.add_argument('--pages', default=None, help='保存的列表页 HTML 目录，默认用 CSV 数据渲染')
+    parser.add_argument('--csv', default='douban_top250_extended.csv', help='用于渲染页面的电影数据')
+    parser.add_argument('--repeat', type=int, default=5, help='每个后端重复解析全部页面的次数')
+    args = parser.parse_args()
+
+    pages, expected = load_pages(args.pages, args.csv)
+    count = check_parity(pages, expected)
+    print(f"一致性校验通过：{len(pages)} 页，{count} 个电影项，后端 {', '.join(extractors)}")
+    bench(pages, args.repeat)
@@ -0,0 +1,78 @@
+import argparse
+import shutil
+import time
+from functools import partial
+
+from crawl_engine import CrawlEngine, NextLinkPagination, UntilEmptyPagination, create_session
+from douban_pages import load_movies, page_size, serve_pages
+from extractors import parse_movies
+from http_cache import ResponseCache
+from week2_grab_price import douban_engine, headers
+
+# 用保存的 CSV 数据在本地模拟豆瓣列表页，测量不同并发数下的抓取速度（页/秒）
+
+
+def build_engine(pagination, url, total, workers, rate, session=None, cache=None):
+    """按分页策略构造引擎；offset 即 week2_grab_price.py 的默认配置"""
+    if pagination == 'offset':
+        return douban_engine(url, total=total, workers=workers, rate=rate, session=session, cache=cache)
+    if pagination == 'until-empty':
+        strategy = UntilEmptyPagination(url + '?start={start}', page_size)
+    else:
+        strategy = NextLinkPagination(url + '?start=0', "//span[@class='next']/a/@href")
+    return CrawlEngine(strategy, partial(parse_movies), headers=headers, workers=workers,
+                       rate=rate, session=session, cache=cache)
+
+
+def collect(engine):
+    return [movie for _, _, page in engine.crawl() for movie in page]
+
+
+def run_cached(pagination, url, expected, rate, cache_dir):
+    """先清空缓存完整抓取一次，再用缓存重新抓取，对比两次耗时"""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    for label in ('首次抓取', '缓存复查'):
+        cache = ResponseCache(cache_dir)
+        engine = build_engine(pagination, url, len(expected), 4, rate, cache=cache)
+        begin = time.perf_counter()
+        movies = collect(engine)
+        elapsed = time.perf_counter() - begin
+        assert movies == expected, '抓取结果与原始数据不一致'
+        print(f"{label}: {elapsed:6.2f}s, 缓存统计 {dict(cache.stats)}")
+
+
+def run(levels, latency, rate, csv_file, pagination='offset', cache_dir=None):
+    expected = load_movies(csv_file)
+    server, url = serve_pages(expected, latency=latency)
+    try:
+        pages = -(-len(expected) // page_size)
+        print(f"本地服务 {url}，共 {pages} 页，分页策略 {pagination}，"
+              f"模拟延迟 {latency}s，限速 {rate or '不限'} 次/秒")
+        for workers in levels:
+            session = create_session(headers, workers)
+            engine = build_engine(pagination, url, len(expected), workers, rate, session=session)
+            begin = time.perf_counter()
+            movies = collect(engine)
+            elapsed = time.perf_counter() - begin
+            session.close()
+            # 校验并发抓取的结果与原始数据完全一致且顺序不变
+            assert movies == expected, '抓取结果与原始数据不一致'
+            print(f"并发 {workers:>2}: {elapsed:6.2f}s, {pages / elapsed:7.2f} 页/秒  "
+                  f"(fetch {engine.timer.seconds['fetch']:.2f}s, parse {engine.timer.seconds['parse']:.2f}s)")
+        if cache_dir:
+            run_cached(pagination, url, expected, rate, cache_dir)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='并发抓取基准测试')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8], help='要测试的并发线程数')
+    parser.add_argument('--latency', type=float, default=0.2, help='每个请求的模拟网络延迟（秒）')
+    parser.add_argument('--rate', type=float, default=None, help='令牌桶限速（次/秒），默认不限速')
+    parser.add_argument('--csv', default='douban_top250_extended.csv', help='用于生成页面的电影数据')
+    parser.add_argument('--pagination', choices=['offset', 'until-empty', 'next-link'], default='offset',
+                        help='分页策略；next-link 只能顺序抓取，并发数不起作用')
+    parser.add_argument('--cache', default=None, help='额外测试响应缓存，指定临时缓存目录')
+    args = parser.parse_args()
+    run(args.levels, args.latency, args.rate, args.csv, args.pagination, args.cache)
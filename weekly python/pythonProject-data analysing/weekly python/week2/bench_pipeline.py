@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_transform import format_mb, peak_rss_mb
+
+# week2 数据管线的端到端基准测试：
+#   extract  — 列表页 HTML 提取（week2_grab_price.py 使用的 extractors 后端）
+#   convert  — CSV 转换（transformor.py，xlsx / parquet / feather）
+#   segment  — 简介分词与词频统计（visualize.py，不使用分词缓存）
+#   render   — 根据词频无界面生成词云图（visualize.py）
+# 每个测试项在独立子进程中运行，由子进程自己记录耗时和峰值内存，结果追加到 JSON 文件中，
+# 并与上一次运行的同一测试项比较，便于发现性能退化。
+
+script = os.path.abspath(__file__)
+# 结果文件放在脚本旁边，与运行时的工作目录无关（已加入 .gitignore）
+results_file = os.path.join(os.path.dirname(script), 'bench_results.json')
+default_sizes = [250, 2500, 25000]
+default_formats = ['xlsx', 'parquet', 'feather']
+
+
+def stage_extract(rows, backend, workdir):
+    from extractors import extractors
+    from synthetic_data import synthetic_pages
+
+    extract = extractors[backend]
+    elapsed = 0.0
+    items = 0
+    # 页面逐个生成、逐个解析，只统计提取本身的耗时
+    for html, expected in synthetic_pages(rows):
+        begin = time.perf_counter()
+        movies = extract(html)
+        elapsed += time.perf_counter() - begin
+        assert movies == expected, '提取结果与合成数据不一致'
+        items += len(movies)
+    return elapsed, items
+
+
+def stage_convert(rows, fmt, workdir):
+    from transformor import convert
+
+    output_file = os.path.join(workdir, f'movies_{rows}.{fmt}')
+    begin = time.perf_counter()
+    count = convert(csv_path(workdir, rows), output_file, fmt)
+    elapsed = time.perf_counter() - begin
+    os.remove(output_file)
+    return elapsed, count
+
+
+def stage_segment(rows, variant, workdir):
+    from visualize import count_words, save_frequencies
+
+    begin = time.perf_counter()
+    counter = count_words(csv_path(workdir, rows))
+    elapsed = time.perf_counter() - begin
+    save_frequencies(counter, freq_path(workdir, rows))
+    return elapsed, rows
+
+
+def stage_render(rows, variant, workdir):
+    import matplotlib
+    matplotlib.use('Agg')
+    from wordcloud.wordcloud import FONT_PATH
+    from visualize import load_frequencies, render_wordcloud
+
+    frequencies = load_frequencies(freq_path(workdir, rows))
+    font_path = 'simhei.ttf' if os.path.exists('simhei.ttf') else FONT_PATH
+    output_file = os.path.join(workdir, f'wordcloud_{rows}.png')
+    begin = time.perf_counter()
+    render_wordcloud(frequencies, output_file, show=False, font_path=font_path)
+    elapsed = time.perf_counter() - begin
+    return elapsed, len(frequencies)
+
+
+stages = {'extract': stage_extract, 'convert': stage_convert, 'segment': stage_segment, 'render': stage_render}
+
+
+def csv_path(workdir, rows):
+    return os.path.join(workdir, f'movies_{rows}.csv')
+
+
+def freq_path(workdir, rows):
+    return os.path.join(workdir, f'word_freq_{rows}.csv')
+
+
+def run_child(stage, rows, variant, workdir):
+    """在子进程中运行一个测试项，返回结果字典"""
+    begin = time.perf_counter()
+    process = subprocess.run([sys.executable, script, '--child', stage, str(rows), variant, workdir],
+                             capture_output=True, text=True)
+    wall = time.perf_counter() - begin
+    if process.returncode:
+        raise RuntimeError(f'测试项失败: {stage} {variant} rows={rows}\n{process.stderr}')
+    elapsed, count, peak_mb = json.loads(process.stdout.strip().splitlines()[-1])
+    return {
+        'stage': stage,
+        'variant': variant,
+        'rows': rows,
+        'seconds': round(elapsed, 4),
+        'process_seconds': round(wall, 4),
+        'items_per_second': round(count / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_mb, 1) if peak_mb is not None else None,
+    }
+
+
+def load_history(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def previous_result(history, result):
+    """在历史记录中找到同一测试项最近一次的结果"""
+    for run in reversed(history):
+        for old in run['results']:
+            if all(old[key] == result[key] for key in ('stage', 'variant', 'rows')):
+                return old
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='week2 数据管线基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='合成数据的行数（250 ~ 1000000）')
+    parser.add_argument('--stages', nargs='+', choices=list(stages), default=list(stages), help='要运行的测试项')
+    parser.add_argument('--backends', nargs='+', default=None, help='提取后端，默认全部')
+    parser.add_argument('--formats', nargs='+', choices=default_formats, default=default_formats, help='转换格式')
+    parser.add_argument('--results', default=results_file, help='结果 JSON 文件，每次运行追加一条记录')
+    args = parser.parse_args()
+
+    from extractors import extractors
+    from synthetic_data import write_csv
+
+    variants = {
+        'extract': args.backends or list(extractors),
+        'convert': args.formats,
+        'segment': ['jieba'],
+        'render': ['wordcloud'],
+    }
+    history = load_history(args.results)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            write_csv(csv_path(workdir, rows), rows)
+            for stage in stages:
+                if stage not in args.stages:
+                    continue
+                # 词云渲染依赖分词统计生成的词频表
+                if stage == 'render' and 'segment' not in args.stages:
+                    continue
+                for variant in variants[stage]:
+                    result = run_child(stage, rows, variant, workdir)
+                    results.append(result)
+                    old = previous_result(history, result)
+                    change = f"  上次 {old['seconds']:.3f}s ({result['seconds'] / old['seconds']:.2f}x)" if old and old['seconds'] else ''
+                    print(f"{stage:<8} {variant:<12} {rows:>8} 行  {result['seconds']:9.3f}s  "
+                          f"峰值内存 {format_mb(result['peak_rss_mb'])}{change}")
+
+    history.append({
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    })
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    print(f"结果已追加到 {args.results}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        stage, rows, variant, workdir = sys.argv[2], int(sys.argv[3]), sys.argv[4], sys.argv[5]
+        elapsed, count = stages[stage](rows, variant, workdir)
+        print(json.dumps([elapsed, count, peak_rss_mb()]))
+    else:
+        main()
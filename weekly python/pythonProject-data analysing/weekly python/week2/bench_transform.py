@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import write_csv
+
+# transformor.py 的基准测试：对合成的大 CSV 分别转换为各种格式，
+# 每次转换在独立子进程中运行，由子进程自己测量转换耗时和峰值内存（RSS）后输出，报告耗时、行/秒和峰值内存
+
+script = os.path.abspath(__file__)
+
+
+def peak_rss_mb():
+    """当前进程的峰值内存（MB）；没有 resource 模块的平台（Windows）返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss 在 macOS 上以字节为单位，在 Linux 上以 KB 为单位
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def format_mb(value):
+    return f'{value:7.1f} MB' if value is not None else f"{'-':>7}"
+
+
+def convert_child(csv_file, output_file, chunksize):
+    """子进程：转换一次，输出 JSON [耗时秒, 峰值 RSS MB]"""
+    from transformor import convert
+
+    begin = time.perf_counter()
+    convert(csv_file, output_file, chunksize=chunksize)
+    elapsed = time.perf_counter() - begin
+    print(json.dumps([elapsed, peak_rss_mb()]))
+
+
+def run_converter(csv_file, output_file, chunksize):
+    """在子进程中转换一次，返回 (耗时秒, 峰值 RSS MB)"""
+    process = subprocess.run([sys.executable, script, '--child', csv_file, output_file, str(chunksize)],
+                             capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError(f'转换失败: {output_file}\n{process.stderr}')
+    elapsed, peak_mb = json.loads(process.stdout.strip().splitlines()[-1])
+    return elapsed, peak_mb
+
+
+if __name__ == '__main__' and len(sys.argv) > 1 and sys.argv[1] == '--child':
+    convert_child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+elif __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CSV 转换基准测试')
+    parser.add_argument('--rows', type=int, default=200000, help='合成 CSV 的行数')
+    parser.add_argument('--chunksize', type=int, default=100000, help='分块转换的每块行数')
+    parser.add_argument('--in-memory', action='store_true', help='同时测试原始的整表读入写 xlsx 方式')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, 'movies.csv')
+        write_csv(csv_file, args.rows)
+        print(f"合成 CSV：{args.rows} 行，{os.path.getsize(csv_file) / 1024 / 1024:.1f} MB")
+
+        cases = [('xlsx', args.chunksize), ('parquet', args.chunksize), ('feather', args.chunksize)]
+        if args.in_memory:
+            cases.insert(0, ('xlsx', 0))
+        for fmt, chunksize in cases:
+            output_file = os.path.join(tmp_dir, f'movies.{fmt}')
+            elapsed, peak_mb = run_converter(csv_file, output_file, chunksize)
+            label = f"{fmt}（{'整表' if not chunksize else '分块'}）"
+            print(f"{label:<14} {elapsed:7.2f}s  {args.rows / elapsed:10.0f} 行/秒  "
+                  f"峰值内存 {format_mb(peak_mb)}  文件 {os.path.getsize(output_file) / 1024 / 1024:7.1f} MB")
+            os.remove(output_file)
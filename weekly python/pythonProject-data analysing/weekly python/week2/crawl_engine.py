@@ -0,0 +1,371 @@
+import requests
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin
+import csv
+import json
+import os
+import random
+import threading
+import time
+
+# 通用的分页列表抓取引擎：
+#   分页策略（按偏移 / 沿下一页链接 / 按偏移直到空页）决定抓哪些 URL；
+#   parse 函数（可以用 ItemExtractor 声明式地定义）把页面 HTML 变成记录列表；
+#   CrawlEngine 用有界线程池并发抓取，按页面顺序交给下游写入，并统计各阶段耗时。
+
+
+class TokenBucket:
+    """线程安全的令牌桶限速器，所有抓取线程共享同一个桶"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取走一个令牌，桶空时阻塞到下一个令牌生成"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class StageTimer:
+    """线程安全地累计各阶段（fetch / parse / write）的耗时和次数"""
+
+    def __init__(self):
+        self.seconds = Counter()
+        self.counts = Counter()
+        self.wall = 0.0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - begin
+            with self.lock:
+                self.seconds[name] += elapsed
+                self.counts[name] += 1
+
+    def report(self):
+        """返回各阶段耗时的文字报告；fetch/parse 为所有线程耗时之和，可能超过总耗时"""
+        lines = [f"总耗时 {self.wall:.2f}s"]
+        for name in ('fetch', 'parse', 'write'):
+            count = self.counts[name]
+            if count:
+                lines.append(f"{name:<6} {self.seconds[name]:8.2f}s  {count:>6} 次  "
+                             f"平均 {self.seconds[name] / count * 1000:8.1f}ms")
+        return '\n'.join(lines)
+
+
+def create_session(headers=None, pool_size=4):
+    """创建带连接池的共享会话，连接池大小与并发数一致"""
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class OffsetPagination:
+    """按 start 偏移翻页，url_template 中的 {start} 依次替换为 first, first+step, ... < stop"""
+    sequential = False
+    until_empty = False
+
+    def __init__(self, url_template, step, first=0, stop=None):
+        self.url_template = url_template
+        self.step = step
+        self.first = first
+        self.stop = stop
+
+    def pages(self):
+        """依次返回 (start, url)；stop 为 None 时无限延伸，由引擎决定何时停止"""
+        start = self.first
+        while self.stop is None or start < self.stop:
+            yield start, self.url_template.format(start=start)
+            start += self.step
+
+    def next_url(self, url, html):
+        return None
+
+
+class UntilEmptyPagination(OffsetPagination):
+    """按偏移翻页，直到某一页没有任何记录为止，适合总数未知的列表"""
+    until_empty = True
+
+    def __init__(self, url_template, step, first=0):
+        super().__init__(url_template, step, first, stop=None)
+
+
+class NextLinkPagination:
+    """沿页面中的“下一页”链接翻页；下一页地址要解析当前页才能得到，所以只能顺序抓取"""
+    sequential = True
+    until_empty = False
+
+    def __init__(self, first_url, next_xpath):
+        self.first_url = first_url
+        self.next_xpath = etree.XPath(next_xpath, smart_strings=False)
+
+    def next_url(self, url, html):
+        links = self.next_xpath(lxml_html.document_fromstring(html))
+        return urljoin(url, links[0]) if links else None
+
+
+class Field:
+    """
+    声明式字段：在每个列表项内求 xpath 的文本值，再经过 transform 处理。
+    default 不为 None 时，xpath 在列表项内找不到元素则直接取 default。
+    """
+
+    def __init__(self, xpath, transform=None, default=None):
+        self.xpath = xpath
+        self.transform = transform
+        self.default = default
+
+
+class ItemExtractor:
+    """
+    按 item_xpath 找出页面中的每个列表项，再按 fields（列名 -> Field）提取每列的值。
+    同一 xpath 在一个列表项内只求值一次，多个字段可以共享同一段文本。
+    """
+
+    def __init__(self, item_xpath, fields):
+        self.items = etree.XPath(item_xpath)
+        self.fields = fields
+        self.texts = {field.xpath: etree.XPath(f'string({field.xpath})', smart_strings=False)
+                      for field in fields.values()}
+        self.exists = {field.xpath: etree.XPath(f'boolean({field.xpath})')
+                       for field in fields.values() if field.default is not None}
+
+    def extract(self, html):
+        """从页面 HTML 中提取记录列表"""
+        records = []
+        root = lxml_html.document_fromstring(html)
+        for item in self.items(root):
+            texts = {}
+            record = {}
+            for name, field in self.fields.items():
+                if field.default is not None and not self.exists[field.xpath](item):
+                    record[name] = field.default
+                    continue
+                if field.xpath not in texts:
+                    texts[field.xpath] = self.texts[field.xpath](item)
+                text = texts[field.xpath]
+                record[name] = field.transform(text) if field.transform else text
+            records.append(record)
+        return records
+
+
+class CrawlEngine:
+    """
+    分页抓取引擎。
+
+    :param pagination: 分页策略（OffsetPagination / UntilEmptyPagination / NextLinkPagination）
+    :param parse: 把页面 HTML 转换为记录列表的函数
+    :param headers: 请求头
+    :param workers: 并发抓取线程数
+    :param rate: 每秒最多请求数，None 表示不限速
+    :param burst: 令牌桶容量（允许的突发请求数）
+    :param max_pending: 已提交但尚未被下游取走的页面数上限，默认为线程数的两倍；
+                        下游写入变慢时不再提交新页面，形成背压
+    :param cache: ResponseCache 实例，None 表示不使用缓存
+    :param session: 共享的 requests.Session，默认新建一个带连接池的会话
+    :param max_retries: 每页最大重试次数
+    :param backoff_base: 重试的初始退避时间（秒），每次重试翻倍
+    """
+
+    def __init__(self, pagination, parse, headers=None, workers=4, rate=None, burst=2,
+                 max_pending=None, cache=None, session=None, max_retries=3, backoff_base=1):
+        self.pagination = pagination
+        self.parse = parse
+        self.workers = workers
+        self.limiter = TokenBucket(rate, max(burst, 1)) if rate else None
+        self.max_pending = max_pending or 2 * workers
+        self.cache = cache
+        self.session = session or create_session(headers, workers)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timer = StageTimer()
+
+    def fetch_page(self, url):
+        """
+        抓取并解析一页，返回 {'records': [...], 'next_url': ...}；失败时按指数退避重试，
+        超过最大重试次数返回 None。使用缓存时发送条件请求，页面未变化则直接复用缓存的记录。
+        """
+        cache = self.cache
+        for retries in range(self.max_retries):
+            if self.limiter:
+                self.limiter.acquire()
+            try:
+                entry = cache.get(url) if cache else None
+                request_headers = cache.conditional_headers(entry) if entry else None
+                # 发送 HTTP 请求
+                with self.timer.stage('fetch'):
+                    response = self.session.get(url, headers=request_headers, timeout=10)
+                    content = response.content
+                if entry and response.status_code == 304:
+                    return cache.revalidated(url, entry, 'not_modified')
+                # 检查请求是否成功
+                response.raise_for_status()
+                # 服务器不支持条件请求时，正文哈希相同也视为未变化
+                digest = cache.body_hash(content) if cache else None
+                if entry and entry['sha256'] == digest:
+                    return cache.revalidated(url, entry, 'unchanged')
+                with self.timer.stage('parse'):
+                    records = self.parse(response.text)
+                    next_url = self.pagination.next_url(url, response.text)
+                if cache:
+                    cache.put(url, response, digest, records, next_url)
+                return {'records': records, 'next_url': next_url}
+            except requests.RequestException as e:
+                print(f"请求出错，第 {retries + 1} 次重试: {e}")
+            except Exception as e:
+                print(f"发生未知错误，第 {retries + 1} 次重试: {e}")
+            # 指数退避并加入随机抖动，避免多个线程同时重试
+            time.sleep(self.backoff_base * 2 ** retries * random.uniform(0.5, 1))
+
+        print(f"达到最大重试次数，跳过页面: {url}")
+        return None
+
+    def _crawl_concurrent(self):
+        pending = deque()
+        pages = iter(self.pagination.pages())
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def submit_next():
+                for key, url in pages:
+                    pending.append((key, url, executor.submit(self.fetch_page, url)))
+                    return True
+                return False
+
+            try:
+                while len(pending) < self.max_pending and submit_next():
+                    pass
+                while pending:
+                    # 总是等待最早提交的页面，保证输出按页面顺序排列
+                    key, url, future = pending.popleft()
+                    page = future.result()
+                    # 直到空页模式下，空页或抓取失败都视为列表结束，避免无限抓取
+                    if self.pagination.until_empty and (page is None or not page['records']):
+                        break
+                    yield key, url, page['records'] if page else []
+                    # 下游取走一页后才补交一页，写入跟不上时抓取随之放缓
+                    submit_next()
+            finally:
+                # 提前结束（遇到空页或下游出错）时取消尚未开始的抓取
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _crawl_sequential(self):
+        url = self.pagination.first_url
+        key = 0
+        while url:
+            page = self.fetch_page(url)
+            if page is None:
+                break
+            yield key, url, page['records']
+            url = page['next_url']
+            key += 1
+
+    def crawl(self):
+        """按页面顺序逐页返回 (key, url, records)，key 为偏移（按偏移翻页）或页码（按链接翻页）"""
+        if self.pagination.sequential:
+            yield from self._crawl_sequential()
+        else:
+            yield from self._crawl_concurrent()
+        if self.cache:
+            self.cache.evict()
+
+    def run(self, sink):
+        """抓取全部页面，逐页调用 sink(key, records) 写入，并记录写入耗时和总耗时"""
+        begin = time.perf_counter()
+        try:
+            for key, _, records in self.crawl():
+                with self.timer.stage('write'):
+                    sink(key, records)
+        finally:
+            self.timer.wall = time.perf_counter() - begin
+
+
+class ResumableCsvWriter:
+    """
+    逐页把记录追加到 CSV 文件，每页写完立即刷新到磁盘，并在检查点文件中记录
+    下一页的 start 偏移和此时 CSV 文件的字节长度。中途退出后重新运行时，先把 CSV
+    截断到最后一个完整页，再从检查点记录的偏移继续抓取，因此 CSV 始终是完整有效的。
+    检查点依赖偏移，只适用于按偏移翻页的抓取。
+    """
+
+    def __init__(self, csv_file, checkpoint_file, fieldnames, step):
+        self.csv_file = csv_file
+        self.checkpoint_file = checkpoint_file
+        self.fieldnames = fieldnames
+        self.step = step
+        self.csvfile = None
+        self.writer = None
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_file, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if os.path.getsize(self.csv_file) >= checkpoint['csv_bytes']:
+                return checkpoint
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save_checkpoint(self, next_start):
+        checkpoint = {'next_start': next_start, 'csv_bytes': self.csvfile.tell()}
+        tmp_file = self.checkpoint_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def open(self):
+        """打开 CSV 文件，返回本次应开始抓取的 start 偏移"""
+        checkpoint = self._load_checkpoint()
+        if checkpoint:
+            # 丢弃上次崩溃时可能写了一半的页面
+            with open(self.csv_file, 'r+b') as f:
+                f.truncate(checkpoint['csv_bytes'])
+            self.csvfile = open(self.csv_file, 'a', newline='', encoding='utf-8-sig')
+            self.writer = csv.DictWriter(self.csvfile, fieldnames=self.fieldnames)
+            print(f"从检查点恢复，start={checkpoint['next_start']}")
+            return checkpoint['next_start']
+
+        self.csvfile = open(self.csv_file, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.DictWriter(self.csvfile, fieldnames=self.fieldnames)
+        # 写入 CSV 文件的列名
+        self.writer.writeheader()
+        self._save_checkpoint(0)
+        return 0
+
+    def write_page(self, start, records):
+        """写入一整页记录并刷新，随后更新检查点"""
+        self.writer.writerows(records)
+        self.csvfile.flush()
+        os.fsync(self.csvfile.fileno())
+        self._save_checkpoint(start + self.step)
+
+    def close(self, completed=False):
+        """关闭 CSV 文件；全部页面完成时删除检查点，下次运行重新完整抓取"""
+        if self.csvfile:
+            self.csvfile.close()
+            self.csvfile = None
+        if completed and os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
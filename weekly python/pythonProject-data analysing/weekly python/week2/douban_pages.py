@@ -0,0 +1,152 @@
+import csv
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 每页电影数量，与豆瓣 Top250 一致
+page_size = 25
+
+# 豆瓣 Top250 列表页中单个电影项的 HTML 结构
+item_template = '''        <li>
+            <div class="item">
+                <div class="pic">
+                    <em class="">{rank}</em>
+                    <a href="https://movie.douban.com/subject/{rank}/">
+                        <img width="100" alt="{title}" src="" class="">
+                    </a>
+                </div>
+                <div class="info">
+                    <div class="hd">
+                        <a href="https://movie.douban.com/subject/{rank}/" class="">
+                            <span class="title">{title}</span>
+                            <span class="other">&nbsp;/&nbsp;{title}</span>
+                        </a>
+                        <span class="playable">[可播放]</span>
+                    </div>
+                    <div class="bd">
+                        <p class="">
+                            {crew}<br>
+                            {date}&nbsp;/&nbsp;{region}&nbsp;/&nbsp;{genre}
+                        </p>
+                        <div class="star">
+                                <span class="rating5-t"></span>
+                                <span class="rating_num" property="v:average">{rating}</span>
+                                <span property="v:best" content="10.0"></span>
+                                <span>{reviews}人评价</span>
+                        </div>
+{quote}                    </div>
+                </div>
+            </div>
+        </li>
+'''
+
+page_template = '''<!DOCTYPE html>
+<html lang="zh-CN" class="ua-windows ua-webkit">
+<head>
+    <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+    <title>豆瓣电影 Top 250</title>
+</head>
+<body>
+<div id="content">
+    <h1>豆瓣电影 Top 250</h1>
+    <div class="article">
+        <ol class="grid_view">
+{items}        </ol>
+        <div class="paginator">
+{paginator}        </div>
+    </div>
+</div>
+</body>
+</html>
+'''
+
+
+def load_movies(csv_file):
+    """从 CSV 文件读取电影信息列表"""
+    with open(csv_file, newline='', encoding='utf-8-sig') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def render_item(rank, movie):
+    """把一条电影信息渲染为豆瓣列表页中的 div.item"""
+    crew = f"导演: {escape(movie['导演'])}"
+    if movie['主演'] != '暂无主演信息':
+        crew += f"&nbsp;&nbsp;&nbsp;主演: {escape(movie['主演'])}"
+    if movie['简介'] != '暂无简介':
+        quote = (f'                        <p class="quote">\n'
+                 f'                            <span class="inq">{escape(movie["简介"])}</span>\n'
+                 f'                        </p>\n')
+    else:
+        quote = ''
+    return item_template.format(
+        rank=rank,
+        title=escape(movie['名称']),
+        crew=crew,
+        date=escape(movie['上映日期']),
+        region=escape(movie.get('地区', '美国')),
+        genre=escape(movie['类型']),
+        rating=escape(movie['评分']),
+        reviews=escape(movie['评价人数']),
+        quote=quote,
+    )
+
+
+def render_page(movies, start, total=None):
+    """渲染 start 偏移处的一整页列表，total 为列表总条数（用于生成“后页”链接）"""
+    total = len(movies) if total is None else total
+    items = ''.join(render_item(start + i + 1, movie)
+                    for i, movie in enumerate(movies[start:start + page_size]))
+    paginator = ''
+    if start + page_size < total:
+        paginator = f'            <span class="next"><a href="?start={start + page_size}&amp;filter=">后页&gt;</a></span>\n'
+    return page_template.format(items=items, paginator=paginator)
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """按 ?start=N 返回对应页面，模拟 movie.douban.com/top250，支持 ETag 条件请求"""
+    pages = {}
+    latency = 0.0
+    last_modified = formatdate(usegmt=True)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        start = int(query.get('start', ['0'])[0])
+        # 与豆瓣一致，超出范围的偏移返回没有电影项的空列表页
+        body = self.pages.get(start, self.pages['empty'])
+        if self.latency:
+            time.sleep(self.latency)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.last_modified)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_pages(movies, latency=0.0, port=0):
+    """
+    在本地线程中启动一个 HTTP 服务，提供 movies 渲染出的各页 HTML。
+    latency 为每个请求的模拟网络延迟（秒）。返回 (server, base_url)，用完后调用 server.shutdown()。
+    """
+    pages = {start: render_page(movies, start).encode('utf-8')
+             for start in range(0, len(movies), page_size)}
+    pages['empty'] = page_template.format(items='', paginator='').encode('utf-8')
+    handler = type('PageHandler', (_PageHandler,), {'pages': pages, 'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/top250'
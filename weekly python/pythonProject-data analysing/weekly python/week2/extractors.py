@@ -0,0 +1,100 @@
+from bs4 import BeautifulSoup
+from functools import lru_cache
+
+try:
+    from crawl_engine import Field, ItemExtractor
+except ImportError:
+    ItemExtractor = None
+
+
+# 豆瓣列表页的电影信息提取器，每个后端接收页面 HTML 文本，返回电影字典列表，
+# 不同后端对同一页面的输出必须完全一致
+
+
+@lru_cache(maxsize=256)
+def split_info(text):
+    """把 div.bd 下第一个 p 的文本拆分为导演、主演、上映日期、类型（多个字段共用，结果缓存）"""
+    info = text.strip().split('\n')
+    director_and_actors = info[0].strip()
+    director = director_and_actors.split('导演: ')[1].split('主演: ')[0].strip()
+    if '主演: ' in director_and_actors:
+        actors = director_and_actors.split('主演: ')[1].strip()
+    else:
+        actors = '暂无主演信息'
+    date_and_type = info[1].strip().split('/')
+    release_date = date_and_type[0].strip()
+    movie_type = date_and_type[-1].strip()
+    return director, actors, release_date, movie_type
+
+
+def make_movie(title, rating, num_reviews, info_text, quote_text):
+    """将提取的信息存储为字典"""
+    director, actors, release_date, movie_type = split_info(info_text)
+    return {
+        '名称': title,
+        '评分': rating,
+        '评价人数': num_reviews.strip('人评价'),
+        '导演': director,
+        '主演': actors,
+        '上映日期': release_date,
+        '类型': movie_type,
+        '简介': quote_text if quote_text is not None else '暂无简介'
+    }
+
+
+def extract_bs4(html):
+    """BeautifulSoup + html.parser 后端（原始实现）"""
+    movies = []
+    # 解析 HTML 内容
+    soup = BeautifulSoup(html, 'html.parser')
+    # 遍历每个电影项，提取所需信息
+    for item in soup.find_all('div', class_='item'):
+        quote = item.find('span', class_='inq')
+        movies.append(make_movie(
+            item.find('span', class_='title').text,
+            item.find('span', class_='rating_num').text,
+            item.find('div', class_='star').find_all('span')[-1].text,
+            item.find('div', class_='bd').p.text,
+            quote.text if quote else None,
+        ))
+    return movies
+
+
+def _has_class(name):
+    """XPath 条件：class 属性中包含 name（与 BeautifulSoup 的 class_ 匹配规则一致）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if ItemExtractor is not None:
+    _info_xpath = f"((.//div[{_has_class('bd')}])[1]//p)[1]"
+
+    # 声明式定义的豆瓣列表项字段，与 csv_columns 一一对应；同一 XPath 在每个列表项内只求值一次
+    douban_fields = {
+        '名称': Field(f"(.//span[{_has_class('title')}])[1]"),
+        '评分': Field(f"(.//span[{_has_class('rating_num')}])[1]"),
+        '评价人数': Field(f"((.//div[{_has_class('star')}])[1]//span)[last()]", lambda text: text.strip('人评价')),
+        '导演': Field(_info_xpath, lambda text: split_info(text)[0]),
+        '主演': Field(_info_xpath, lambda text: split_info(text)[1]),
+        '上映日期': Field(_info_xpath, lambda text: split_info(text)[2]),
+        '类型': Field(_info_xpath, lambda text: split_info(text)[3]),
+        '简介': Field(f"(.//span[{_has_class('inq')}])[1]", default='暂无简介'),
+    }
+    douban_extractor = ItemExtractor(f"//div[{_has_class('item')}]", douban_fields)
+
+
+# 可用的提取后端，lxml 未安装时只保留 html.parser
+extractors = {'html.parser': extract_bs4}
+if ItemExtractor is not None:
+    extractors['lxml'] = douban_extractor.extract
+
+# 默认使用最快的可用后端
+default_backend = 'lxml' if 'lxml' in extractors else 'html.parser'
+
+
+def parse_movies(html, backend=default_backend):
+    """用指定后端从列表页 HTML 中提取电影信息，返回电影字典列表"""
+    try:
+        extract = extractors[backend]
+    except KeyError:
+        raise ValueError(f"未知的提取后端: {backend}，可选: {', '.join(extractors)}") from None
+    return extract(html)
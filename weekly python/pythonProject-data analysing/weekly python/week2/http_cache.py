@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# 缓存条目的默认最长保存时间（秒）和缓存目录的最大容量（字节）
+default_max_age = 7 * 24 * 3600
+default_max_bytes = 50 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    按 URL 持久化的 HTTP 响应缓存。
+
+    每个 URL 对应两个文件：<key>.html 保存响应正文，<key>.json 保存 ETag、Last-Modified、
+    正文哈希以及上次从正文中提取出的记录列表和下一页地址。再次抓取时发送条件请求，
+    服务器返回 304 或正文哈希未变时直接复用缓存的记录，不再重新解析。
+    """
+
+    def __init__(self, cache_dir='http_cache', max_age=default_max_age, max_bytes=default_max_bytes):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        # 统计命中情况：not_modified（304）、unchanged（哈希相同）、stored（重新解析）
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _write(self, path, data):
+        # 先写临时文件再替换，避免中途崩溃留下损坏的缓存
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def get(self, url):
+        """返回 URL 的缓存条目，不存在、损坏或已过期时返回 None"""
+        try:
+            with open(self._path(url, '.json'), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if 'records' not in entry or time.time() - entry['validated'] > self.max_age:
+            return None
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        """根据缓存条目构造条件请求头"""
+        request_headers = {}
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+        return request_headers
+
+    @staticmethod
+    def body_hash(body):
+        return hashlib.sha256(body).hexdigest()
+
+    def revalidated(self, url, entry, reason):
+        """条目经 304 或哈希比对确认仍然有效，刷新校验时间并返回该条目"""
+        entry['validated'] = time.time()
+        self._write(self._path(url, '.json'), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        self._count(reason)
+        return entry
+
+    def put(self, url, response, digest, records, next_url=None):
+        """保存新的响应正文及其解析结果"""
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': digest,
+            'size': len(response.content),
+            'validated': time.time(),
+            'records': records,
+            'next_url': next_url,
+        }
+        self._write(self._path(url, '.html'), response.content)
+        self._write(self._path(url, '.json'), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        self._count('stored')
+
+    def evict(self):
+        """删除过期条目；总大小超过上限时按最近校验时间从旧到新删除"""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            body_path = meta_path[:-len('.json')] + '.html'
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    validated = json.load(f)['validated']
+                size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+            except (OSError, ValueError, KeyError):
+                validated, size = 0, 0
+            entries.append((validated, size, meta_path, body_path))
+
+        entries.sort()
+        total = sum(size for _, size, _, _ in entries)
+        removed = 0
+        for validated, size, meta_path, body_path in entries:
+            if now - validated <= self.max_age and total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import jieba
+
+# jieba 分词结果的持久化缓存：按文本的哈希保存分词结果，内容没有变化的文本不再重复分词；
+# 缓存未命中的新文本较多时，分批交给进程池并行分词。进程池由调用方创建一次，
+# 多次调用 segment_texts（例如逐块统计词频）时共用，每个进程只启动并加载词典一次。
+
+cache_file = 'jieba_cache.sqlite'
+# 未命中的文本少于该数量时直接在当前进程分词，避免为少量文本启动进程池（每个进程都要加载词典）
+min_parallel = 2000
+# 每个进程任务包含的文本数
+batch_size = 500
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class TokenCache:
+    """
+    基于 SQLite 的分词缓存，键为文本的 SHA-1，值为分词结果的 JSON 列表。
+    缓存与 jieba 版本绑定，版本变化时自动清空，避免新旧词典的分词结果混用。
+    """
+
+    def __init__(self, path=cache_file):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS tokens (hash TEXT PRIMARY KEY, tokens TEXT NOT NULL)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'jieba'").fetchone()
+        if row is None or row[0] != jieba.__version__:
+            self.conn.execute('DELETE FROM tokens')
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('jieba', ?)", (jieba.__version__,))
+        self.conn.commit()
+
+    def get_many(self, hashes):
+        """返回 {哈希: 分词列表}，只包含缓存中已有的条目"""
+        found = {}
+        hashes = list(hashes)
+        # SQLite 单条语句的参数数量有限，分批查询
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(f'SELECT hash, tokens FROM tokens WHERE hash IN ({placeholders})', batch)
+            found.update((key, json.loads(tokens)) for key, tokens in rows)
+        return found
+
+    def put_many(self, items):
+        """写入 {哈希: 分词列表}"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO tokens VALUES (?, ?)',
+                                  ((key, json.dumps(tokens, ensure_ascii=False)) for key, tokens in items.items()))
+
+    def close(self):
+        self.conn.close()
+
+
+def _segment_batch(texts):
+    """进程池任务：对一批文本分词"""
+    return [jieba.lcut(text) for text in texts]
+
+
+def segment_pool(workers=None):
+    """
+    创建供 segment_texts 复用的分词进程池，用 with 语句管理；workers 默认为 CPU 核数，
+    为 1 时 with 语句得到 None（始终在当前进程分词）。进程在第一次提交任务时才启动，并预先加载 jieba 词典。
+    """
+    workers = workers or os.cpu_count()
+    if workers <= 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=workers, initializer=jieba.initialize)
+
+
+def segment_texts(texts, cache=None, workers=None, executor=None):
+    """
+    逐条对 texts 分词，返回与 texts 一一对应的分词列表。
+
+    :param texts: 文本列表
+    :param cache: TokenCache 实例，None 表示不使用缓存
+    :param workers: 没有传入 executor 时临时进程池的大小，默认为 CPU 核数；为 1 时始终在当前进程分词
+    :param executor: segment_pool() 创建的进程池，多次调用时共用；None 时按 workers 临时创建
+    """
+    hashes = [text_hash(text) for text in texts]
+    known = cache.get_many(set(hashes)) if cache else {}
+
+    # 相同文本只分词一次
+    missing = {}
+    for key, text in zip(hashes, texts):
+        if key not in known:
+            missing.setdefault(key, text)
+
+    if missing:
+        keys = list(missing)
+        pending = [missing[key] for key in keys]
+        if len(pending) < min_parallel:
+            results = _segment_batch(pending)
+        else:
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            with nullcontext(executor) if executor is not None else segment_pool(workers) as pool:
+                if pool is None:
+                    results = _segment_batch(pending)
+                else:
+                    results = [tokens for batch in pool.map(_segment_batch, batches) for tokens in batch]
+        segmented = dict(zip(keys, results))
+        if cache:
+            cache.put_many(segmented)
+        known.update(segmented)
+
+    return [known[key] for key in hashes]
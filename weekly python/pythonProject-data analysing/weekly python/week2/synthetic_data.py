@@ -0,0 +1,54 @@
+import csv
+import os
+import random
+
+from douban_pages import load_movies, page_size, render_page
+
+# 合成任意规模的豆瓣形状数据（电影字典、CSV、列表页 HTML），用于基准测试。
+# 以真实的 250 条电影数据为模板，对名称、评分、评价人数和简介做随机变化，
+# 相同的 rows 和 seed 总是生成相同的数据。
+
+source_csv = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'douban_top250_extended.csv')
+
+
+def synthetic_movies(rows, seed=0, source=source_csv):
+    """逐条生成 rows 条电影字典"""
+    rng = random.Random(seed)
+    movies = load_movies(source)
+    quotes = [movie['简介'] for movie in movies if movie['简介'] != '暂无简介']
+    for i in range(rows):
+        movie = dict(movies[i % len(movies)])
+        movie['名称'] = f"{movie['名称']} {i}"
+        movie['评分'] = f'{rng.uniform(7.0, 9.9):.1f}'
+        movie['评价人数'] = str(rng.randint(1000, 3000000))
+        # 简介由两条真实简介拼接，保证分词时文本足够多样，约一成保留占位文本
+        if rng.random() < 0.1:
+            movie['简介'] = '暂无简介'
+        else:
+            movie['简介'] = rng.choice(quotes) + rng.choice(quotes)
+        yield movie
+
+
+def write_csv(path, rows, seed=0):
+    """生成 rows 行的合成 CSV，列与 douban_top250_extended.csv 相同"""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        writer = None
+        for movie in synthetic_movies(rows, seed):
+            if writer is None:
+                writer = csv.DictWriter(csvfile, fieldnames=list(movie))
+                writer.writeheader()
+            writer.writerow(movie)
+
+
+def synthetic_pages(rows, seed=0):
+    """逐页生成豆瓣 Top250 结构的列表页 HTML，返回 (页面 HTML, 该页电影列表)"""
+    page = []
+    start = 0
+    for movie in synthetic_movies(rows, seed):
+        page.append(movie)
+        if len(page) == page_size:
+            yield render_page(page, 0, total=rows - start), page
+            start += page_size
+            page = []
+    if page:
+        yield render_page(page, 0, total=len(page)), page
@@ -0,0 +1,50 @@
+import glob
+import json
+import os
+
+import pytest
+
+from douban_pages import page_size
+from extractors import extractors, parse_movies
+
+# 提取后端的一致性测试：fixtures/top250 下保存了豆瓣 Top250 全部 10 页列表页
+# 和一个超出范围的空页（start_250.html），movies.json 为按顺序排列的期望结果。
+# 每一页上所有后端的输出必须与 html.parser 后端完全相同，且与期望结果一致。
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'top250')
+page_files = sorted(glob.glob(os.path.join(fixtures_dir, 'start_*.html')))
+
+
+def read_page(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def expected_movies(path):
+    """页面文件名中的 start 偏移处的一页期望结果"""
+    start = int(os.path.basename(path)[len('start_'):-len('.html')])
+    with open(os.path.join(fixtures_dir, 'movies.json'), encoding='utf-8') as f:
+        movies = json.load(f)
+    return movies[start:start + page_size]
+
+
+def test_fixtures_present():
+    assert len(page_files) == 11
+
+
+@pytest.mark.parametrize('path', page_files, ids=os.path.basename)
+@pytest.mark.parametrize('backend', sorted(set(extractors) - {'html.parser'}))
+def test_backend_matches_html_parser(backend, path):
+    html = read_page(path)
+    assert extractors[backend](html) == extractors['html.parser'](html)
+
+
+@pytest.mark.parametrize('path', page_files, ids=os.path.basename)
+@pytest.mark.parametrize('backend', sorted(extractors))
+def test_backend_matches_expected(backend, path):
+    assert parse_movies(read_page(path), backend) == expected_movies(path)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse_movies(read_page(page_files[0]), 'no-such-backend')
@@ -1,11 +1,233 @@
-import pandas as pd
-
-# 读取 CSV 文件
-csv_file = 'douban_top250_extended.csv'
-df = pd.read_csv(csv_file)
-
-# 将数据保存为 Excel 文件
-excel_file = 'douban_top250_extended.xlsx'
-df.to_excel(excel_file, index=False)
-
-print(f'已成功将 {csv_file} 转换为 {excel_file}')
\ No newline at end of file
+import argparse
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Excel 单个工作表最多 1048576 行（含表头），超出时自动拆分到下一个工作表
+excel_max_rows = 1048576
+# 每次从 CSV 读取的行数，内存占用只与块大小有关，与文件总行数无关
+chunk_size = 100000
+# 支持的输出格式及对应的扩展名
+formats = {'.xlsx': 'xlsx', '.parquet': 'parquet', '.feather': 'feather'}
+
+
+def read_chunks(csv_file, chunksize=chunk_size):
+    """
+    分块读取 CSV。使用可空整数等扩展类型，避免某一块中出现空值时整列从整数变成浮点数，
+    导致各块的列类型不一致。
+    """
+    return pd.read_csv(csv_file, chunksize=chunksize, dtype_backend='numpy_nullable')
+
+
+@contextmanager
+def atomic_output(output_file):
+    """
+    返回临时文件路径，with 代码块正常结束后用它替换 output_file；出错时删除临时文件，
+    转换失败时不会留下不完整的输出文件
+    """
+    # 临时文件保留原扩展名，pandas 等按扩展名选择写入格式
+    root, ext = os.path.splitext(output_file)
+    tmp_file = f'{root}.{os.getpid()}.tmp{ext}'
+    try:
+        yield tmp_file
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+def movie_table(csv_file, typed=True):
+    """
+    csv_file 是豆瓣电影表时返回内存映射的类型化 Arrow 表（见 movie_dataset.py），不再解析 CSV 文本；
+    Arrow 文件不存在或比 CSV 旧时先重新生成。其他文件或 typed 为 False 时返回 None。
+    """
+    if not typed:
+        return None
+    import movie_dataset
+
+    if os.path.abspath(csv_file) != os.path.abspath(movie_dataset.csv_file):
+        return None
+    if not movie_dataset.dataset_is_fresh(csv_file, movie_dataset.dataset_file):
+        movie_dataset.build_dataset(csv_file, movie_dataset.dataset_file)
+    return movie_dataset.load_dataset(movie_dataset.dataset_file)
+
+
+def iter_frames(csv_file, chunksize=chunk_size, typed=True):
+    """逐块返回 DataFrame；豆瓣电影表从类型化数据集中切片，其余文件分块读取 CSV"""
+    table = movie_table(csv_file, typed)
+    if table is None:
+        yield from read_chunks(csv_file, chunksize)
+        return
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # float32 的评分按最短十进制表示转为 float64，写入单元格的是 9.7 而不是 9.699999809…
+    for i, field in enumerate(table.schema):
+        if pa.types.is_float32(field.type):
+            column = pc.cast(pc.cast(table.column(i), pa.string()), pa.float64())
+            table = table.set_column(i, field.name, column)
+    for offset in range(0, len(table), chunksize):
+        yield table.slice(offset, chunksize).to_pandas()
+
+
+def to_xlsx(csv_file, excel_file, chunksize=chunk_size, max_rows=excel_max_rows, typed=True):
+    """用 openpyxl 的只写模式逐行写入 xlsx，超过 max_rows 行时新建工作表"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+    total = 0
+    for chunk in iter_frames(csv_file, chunksize, typed):
+        header = list(chunk.columns)
+        # 空值写成空单元格
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            if sheet is None or sheet_rows >= max_rows:
+                sheet = workbook.create_sheet(f'Sheet{len(workbook.worksheets) + 1}')
+                sheet.append(header)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        total += len(chunk)
+    with atomic_output(excel_file) as tmp_file:
+        workbook.save(tmp_file)
+    return total
+
+
+def unified_schema(csv_file, chunksize=chunk_size):
+    """
+    先完整扫描一遍 CSV，得到所有块共同的 Arrow 列类型：各块类型相同时保持不变，
+    只有整数和浮点数时统一为 float64，全为空值的块不参与判断，其余冲突一律改为字符串。
+    只按第一块的类型写入时，后面的块出现更宽的类型（如整数列出现 1.5）会写入失败。
+    """
+    import pyarrow as pa
+
+    names = None
+    types = {}
+    for chunk in read_chunks(csv_file, chunksize):
+        schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+        if names is None:
+            names = schema.names
+        for field in schema:
+            types.setdefault(field.name, set()).add(field.type)
+
+    fields = []
+    for name in names or []:
+        column_types = {t for t in types[name] if not pa.types.is_null(t)}
+        if not column_types:
+            column_type = pa.null()
+        elif len(column_types) == 1:
+            column_type = column_types.pop()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in column_types):
+            column_type = pa.float64()
+        else:
+            column_type = pa.string()
+        fields.append(pa.field(name, column_type))
+    return pa.schema(fields)
+
+
+def iter_tables(csv_file, chunksize=chunk_size, typed=True):
+    """
+    返回 (schema, 逐块的 Arrow 表)。豆瓣电影表直接切片内存映射的类型化数据集，保留其列类型和字典编码；
+    其余文件先扫描一遍得到统一的列类型，再逐块读取 CSV 并转换。
+    """
+    import pyarrow as pa
+
+    table = movie_table(csv_file, typed)
+    if table is not None:
+        return table.schema, (table.slice(offset, chunksize) for offset in range(0, len(table), chunksize))
+    schema = unified_schema(csv_file, chunksize)
+    return schema, (pa.Table.from_pandas(chunk, preserve_index=False).cast(schema)
+                    for chunk in read_chunks(csv_file, chunksize))
+
+
+def write_arrow_chunks(csv_file, output_file, chunksize, open_writer, typed=True):
+    """
+    按统一的列类型逐块写入 Arrow 格式文件，先写入临时文件（见 atomic_output）。
+    open_writer(path, schema) 返回 (writer, 需要关闭的对象列表)。
+    """
+    schema, tables = iter_tables(csv_file, chunksize, typed)
+    total = 0
+    with atomic_output(output_file) as tmp_file:
+        writer, resources = open_writer(tmp_file, schema)
+        try:
+            for table in tables:
+                writer.write_table(table)
+                total += len(table)
+        finally:
+            for resource in [writer] + resources:
+                resource.close()
+    return total
+
+
+def to_parquet(csv_file, parquet_file, chunksize=chunk_size, typed=True):
+    """逐块写入 Parquet，每块成为一个 row group"""
+    import pyarrow.parquet as pq
+
+    def open_writer(path, schema):
+        return pq.ParquetWriter(path, schema), []
+
+    return write_arrow_chunks(csv_file, parquet_file, chunksize, open_writer, typed)
+
+
+def to_feather(csv_file, feather_file, chunksize=chunk_size, typed=True):
+    """逐块写入 Feather（Arrow IPC 文件格式，lz4 压缩）"""
+    import pyarrow as pa
+
+    def open_writer(path, schema):
+        sink = pa.OSFile(path, 'wb')
+        writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression='lz4'))
+        return writer, [sink]
+
+    return write_arrow_chunks(csv_file, feather_file, chunksize, open_writer, typed)
+
+
+def to_excel_in_memory(csv_file, excel_file):
+    """原始实现：整个文件读入 DataFrame 后一次性写入 xlsx，仅用于小文件和基准对比"""
+    df = pd.read_csv(csv_file)
+    with atomic_output(excel_file) as tmp_file:
+        df.to_excel(tmp_file, index=False)
+    return len(df)
+
+
+converters = {'xlsx': to_xlsx, 'parquet': to_parquet, 'feather': to_feather}
+
+
+def convert(csv_file, output_file, fmt=None, chunksize=chunk_size, typed=True):
+    """
+    把 CSV 文件转换为 xlsx / Parquet / Feather，返回写入的行数。
+
+    :param csv_file: 输入 CSV 文件
+    :param output_file: 输出文件
+    :param fmt: 输出格式，默认按 output_file 的扩展名判断
+    :param chunksize: 每块行数；为 0 时使用原始的整表读入方式（只支持 xlsx）
+    :param typed: 豆瓣电影表是否从类型化数据集（movie_dataset.py）读取；数据集中上映日期只保留年份，
+                  需要原样保留 CSV 文本时传入 False
+    """
+    fmt = fmt or formats.get(os.path.splitext(output_file)[1].lower())
+    if fmt not in converters:
+        raise ValueError(f"无法识别输出格式: {output_file}，可选: {', '.join(converters)}")
+    if not chunksize:
+        if fmt != 'xlsx':
+            raise ValueError('整表读入方式只支持 xlsx')
+        return to_excel_in_memory(csv_file, output_file)
+    return converters[fmt](csv_file, output_file, chunksize, typed=typed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CSV 转换为 xlsx / Parquet / Feather')
+    parser.add_argument('csv_file', nargs='?', default='douban_top250_extended.csv', help='输入 CSV 文件')
+    parser.add_argument('output_file', nargs='?', default='douban_top250_extended.xlsx', help='输出文件')
+    parser.add_argument('--format', choices=list(converters), default=None, help='输出格式，默认按扩展名判断')
+    parser.add_argument('--chunksize', type=int, default=chunk_size, help='每块行数，0 表示整表读入')
+    parser.add_argument('--text', action='store_true', help='豆瓣电影表也按文本解析 CSV，不使用类型化数据集')
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    rows = convert(args.csv_file, args.output_file, args.format, args.chunksize, typed=not args.text)
+    elapsed = time.perf_counter() - begin
+    print(f'已成功将 {args.csv_file} 转换为 {args.output_file}（{rows} 行，{elapsed:.2f}s）')
@@ -1,24 +1,122 @@
-import pandas as pd
-from wordcloud import WordCloud
-import jieba
-import matplotlib.pyplot as plt
-
-# 读取 CSV 文件
-csv_file = 'douban_top250_extended.csv'
-df = pd.read_csv(csv_file)
-
-# 合并所有电影简介
-all_quotes = ' '.join(df['简介'])
-
-# 使用 jieba 进行中文分词
-words = jieba.lcut(all_quotes)
-text = ' '.join(words)
-
-# 生成词云图
-wordcloud = WordCloud(font_path='simhei.ttf', background_color='white').generate(text)
-
-# 显示词云图
-plt.figure(figsize=(10, 6))
-plt.imshow(wordcloud, interpolation='bilinear')
-plt.axis('off')
-plt.show()
+import argparse
+import csv
+import re
+from collections import Counter
+
+import pandas as pd
+from wordcloud import STOPWORDS, WordCloud
+import matplotlib.pyplot as plt
+from movie_dataset import dataset_file, dataset_is_fresh, load_dataset
+from segment_cache import TokenCache, segment_pool, segment_texts
+
+# 读取电影数据的 CSV 文件及保存词频表的文件
+csv_file = 'douban_top250_extended.csv'
+freq_file = 'word_freq.csv'
+# 每次处理的简介条数，内存占用只与块大小有关
+chunk_size = 50000
+# 没有简介时爬虫填入的占位文本，不参与统计
+placeholder = '暂无简介'
+# 停用词：WordCloud 自带的英文停用词加上常见的中文虚词
+stopwords = set(STOPWORDS) | {
+    '的', '了', '是', '在', '和', '就', '都', '而', '及', '与', '着', '或', '也', '又', '被', '把',
+    '一个', '没有', '我们', '你们', '他们', '自己', '这个', '那个', '什么', '一种', '不是', '就是',
+}
+# 与 WordCloud.generate 的分词规则一致：至少两个字符，且以文字开头；纯数字的词另外在 is_word 中去掉
+word_pattern = re.compile(r"\w[\w']+")
+
+
+def is_word(word):
+    """是否计入词频：不是停用词，符合 word_pattern，且不是纯数字（WordCloud 默认去掉数字）"""
+    return word not in stopwords and not word.isdigit() and word_pattern.fullmatch(word) is not None
+
+
+def iter_quotes(csv_path=csv_file, chunksize=chunk_size):
+    """
+    按块返回简介列表。类型化的 Arrow 文件是最新的时从内存映射中零拷贝切片，
+    否则分块读取 CSV 的简介列。
+    """
+    if csv_path == csv_file and dataset_is_fresh(csv_path, dataset_file):
+        column = load_dataset(dataset_file, ['简介'])['简介']
+        for offset in range(0, len(column), chunksize):
+            yield column.slice(offset, chunksize).to_pylist()
+    else:
+        for chunk in pd.read_csv(csv_path, usecols=['简介'], chunksize=chunksize):
+            yield chunk['简介'].fillna('').astype(str).tolist()
+
+
+def count_words(csv_path=csv_file, chunksize=chunk_size, cache=None, workers=None):
+    """逐块分词、过滤停用词并累加词频，返回 Counter；各块共用同一个分词进程池"""
+    counter = Counter()
+    with segment_pool(workers) as executor:
+        for quotes in iter_quotes(csv_path, chunksize):
+            quotes = [quote for quote in quotes if quote and quote != placeholder]
+            for tokens in segment_texts(quotes, cache, executor=executor):
+                counter.update(word for word in tokens if is_word(word))
+    return counter
+
+
+def save_frequencies(counter, path=freq_file):
+    """按词频从高到低保存词频表"""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['词语', '词频'])
+        writer.writerows(counter.most_common())
+
+
+def load_frequencies(path=freq_file):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)
+        return {word: int(count) for word, count in reader}
+
+
+def render_wordcloud(frequencies, output=None, show=True, font_path='simhei.ttf',
+                     background_color='white', colormap=None, max_words=200, width=800, height=400):
+    """根据词频生成词云图，可保存为图片；show 为 False 时不弹出窗口"""
+    wordcloud = WordCloud(font_path=font_path, background_color=background_color, colormap=colormap,
+                          max_words=max_words, width=width, height=height)
+    wordcloud.generate_from_frequencies(frequencies)
+    if output:
+        wordcloud.to_file(output)
+        print(f"词云图已保存到 {output}")
+    if show:
+        # 显示词云图
+        plt.figure(figsize=(10, 6))
+        plt.imshow(wordcloud, interpolation='bilinear')
+        plt.axis('off')
+        plt.show()
+    return wordcloud
+
+
+def main():
+    parser = argparse.ArgumentParser(description='电影简介词云图')
+    parser.add_argument('--csv', default=csv_file, help='电影数据 CSV 文件')
+    parser.add_argument('--freq', default=freq_file, help='词频表文件')
+    parser.add_argument('--from-freq', action='store_true', help='直接使用已保存的词频表，跳过分词统计')
+    parser.add_argument('--chunksize', type=int, default=chunk_size, help='每块处理的简介条数')
+    parser.add_argument('--output', default=None, help='保存词云图的文件名')
+    parser.add_argument('--no-show', action='store_true', help='不弹出窗口（用于无界面环境）')
+    parser.add_argument('--font', default='simhei.ttf', help='支持中文的字体文件')
+    parser.add_argument('--background', default='white', help='背景颜色')
+    parser.add_argument('--colormap', default=None, help='matplotlib 颜色映射名称')
+    parser.add_argument('--max-words', type=int, default=200, help='最多显示的词数')
+    args = parser.parse_args()
+
+    if args.from_freq:
+        frequencies = load_frequencies(args.freq)
+    else:
+        # 使用 jieba 逐块分词，已分过词的简介直接从缓存读取
+        cache = TokenCache()
+        try:
+            frequencies = count_words(args.csv, args.chunksize, cache)
+        finally:
+            cache.close()
+        save_frequencies(frequencies, args.freq)
+        print(f"词频表已保存到 {args.freq}（{len(frequencies)} 个词）")
+
+    render_wordcloud(frequencies, args.output, not args.no_show, font_path=args.font,
+                     background_color=args.background, colormap=args.colormap, max_words=args.max_words)
+
+
+if __name__ == '__main__':
+    main()